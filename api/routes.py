@@ -118,10 +118,10 @@ def create_api(config):
                 SELECT dp.*, d.domain
                 FROM discovered_paths dp
                 JOIN domains d ON dp.domain_id = d.id
-                WHERE dp.discovered_at >= datetime('now', '-{} hours')
-            '''.format(hours)
+                WHERE dp.discovered_at >= datetime('now', ?)
+            '''
             
-            params = []
+            params = [f'-{hours} hours']
             
             if domain:
                 query += ' AND d.domain LIKE ?'
@@ -5,10 +5,126 @@ Configuración principal del sistema WebFuzzing Pro
 
 import json
 import os
+import sys
+import copy
+import hashlib
 import logging
+import threading
+from collections import namedtuple
+from functools import cached_property
 from typing import Dict, Any, Optional, Union
 from pathlib import Path
-import yaml
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Dependencia opcional: se usa json estándar
+
+# PyYAML se importa bajo demanda: las instalaciones con config.json no lo cargan
+_yaml_support = None
+
+def _get_yaml():
+    """
+    Importar PyYAML y resolver Loader/Dumper en el primer uso
+    
+    Usa las clases en C (libyaml) cuando están disponibles; si no, las de
+    Python puro. Lanza ImportError si PyYAML no está instalado.
+    """
+    global _yaml_support
+    if _yaml_support is None:
+        import yaml
+        _yaml_support = (
+            yaml,
+            getattr(yaml, 'CSafeLoader', yaml.SafeLoader),
+            getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+        )
+    return _yaml_support
+
+def _env_bool(value: str) -> bool:
+    """Interpretar una variable de entorno como booleano"""
+    return value.lower() in ('true', '1', 'yes', 'on')
+
+def _env_list(value: str) -> list:
+    """Interpretar una variable de entorno como lista separada por comas"""
+    return value.split(',')
+
+# Directorio raíz del proyecto (resuelto una sola vez al importar el módulo)
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Variables de entorno que sobrescriben la configuración: ruta y conversor de tipo
+_ENV_PREFIX = 'WEBFUZZING_'
+_ENV_MAPPINGS = {
+    'WEBFUZZING_API_KEY': (('api', 'api_key'), str),
+    'WEBFUZZING_API_HOST': (('api', 'host'), str),
+    'WEBFUZZING_API_PORT': (('api', 'port'), int),
+    'WEBFUZZING_WEB_HOST': (('web', 'host'), str),
+    'WEBFUZZING_WEB_PORT': (('web', 'port'), int),
+    'WEBFUZZING_DB_PATH': (('database', 'path'), str),
+    'WEBFUZZING_DEBUG': (('system', 'debug'), _env_bool),
+    'WEBFUZZING_LOG_LEVEL': (('logging', 'level'), str),
+    'WEBFUZZING_TELEGRAM_TOKEN': (('notifications', 'telegram', 'bot_token'), str),
+    'WEBFUZZING_TELEGRAM_CHAT_IDS': (('notifications', 'telegram', 'chat_ids'), _env_list),
+}
+
+# Marcas de la caché de Config.get: clave inexistente / clave aún no resuelta
+_MISSING = object()
+_UNCACHED = object()
+
+# Valores de fuzzing resueltos de una vez para los bucles de peticiones
+ConfigSnapshot = namedtuple('ConfigSnapshot', [
+    'timeout', 'max_workers', 'user_agent', 'retry_count', 'delay',
+    'status_codes', 'critical_paths', 'verify_ssl'
+])
+
+# Clave de la instantánea dentro de la caché de get (no colisiona con claves str)
+_SNAPSHOT_KEY = object()
+
+# Último YAML parseado por archivo en este proceso: ruta -> (hash del contenido, datos)
+_PARSE_CACHE: Dict[str, tuple] = {}
+
+# Sufijo de la caché JSON que acompaña a cada YAML (<archivo>.cache.json)
+_YAML_CACHE_SUFFIX = '.cache.json'
+
+# Claves en notación punto ya separadas ('api.port' -> ('api', 'port'))
+_SPLIT_KEYS: Dict[str, tuple] = {}
+
+def _write_json(data: Any, path: str) -> None:
+    """Escribir JSON indentado (orjson si está disponible, json estándar si no)"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+def _dumps_json(data: Any) -> bytes:
+    """Serializar a JSON compacto (orjson si está disponible)"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode('utf-8')
+
+def _loads_json(raw: bytes) -> Any:
+    """Deserializar JSON (orjson si está disponible)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _freeze(value: Any) -> Any:
+    """Vista de solo lectura de un valor: dict -> MappingProxyType, list -> tuple"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def _thaw(value: Any) -> Any:
+    """Copia modificable de un valor: MappingProxyType/dict -> dict, tuple/list -> list"""
+    if isinstance(value, (dict, MappingProxyType)):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_thaw(v) for v in value]
+    return value
 
 class Config:
     """Gestor de configuración del sistema"""
@@ -128,78 +244,159 @@ class Config:
             }
         }
         
+        # Caché de Config.get por clave (se invalida al modificar la configuración)
+        self._get_cache: Dict[str, Any] = {}
+        
+        # Claves modificadas con set() desde la última carga/guardado y archivo
+        # del que proviene la configuración en memoria
+        self._dirty: set = set()
+        self._source_file: Optional[str] = None
+        
         # Cargar configuración
         self.config = self._load_config()
     
     def _load_config(self) -> Dict[str, Any]:
         """Cargar configuración desde archivo"""
-        config = self.default_config.copy()
+        self._get_cache.clear()
+        self._dirty.clear()
+        self._source_file = None
+        # Copia profunda: set() y los overrides no deben modificar default_config
+        config = copy.deepcopy(self.default_config)
         
         # Intentar cargar desde archivos de configuración
-        for config_file in self.config_files:
-            if config_file and os.path.exists(config_file):
-                try:
-                    loaded_config = self._load_config_file(config_file)
-                    if loaded_config:
-                        config = self._merge_configs(config, loaded_config)
-                        self.logger.info(f"Configuración cargada desde: {config_file}")
-                        break
-                except Exception as e:
-                    self.logger.warning(f"Error cargando configuración desde {config_file}: {e}")
-                    continue
+        for config_file in self._existing_config_files():
+            try:
+                loaded_config = self._load_config_file(config_file)
+                if loaded_config:
+                    config = self._merge_configs(config, loaded_config)
+                    self._source_file = config_file
+                    self.logger.info(f"Configuración cargada desde: {config_file}")
+                    break
+            except Exception as e:
+                self.logger.warning(f"Error cargando configuración desde {config_file}: {e}")
+                continue
         
         # Cargar variables de entorno
         config = self._load_env_overrides(config)
         
         return config
     
+    def _existing_config_files(self) -> list:
+        """
+        Candidatos de config_files que existen, en orden de prioridad
+        
+        Los nombres por defecto se comprueban contra un único listado del
+        directorio actual en lugar de un stat por candidato.
+        """
+        explicit, defaults = self.config_files[0], self.config_files[1:]
+        existing = [explicit] if explicit and os.path.exists(explicit) else []
+        
+        try:
+            present = {os.path.normcase(name) for name in os.listdir('.')}
+        except OSError:
+            return existing
+        
+        existing.extend(name for name in defaults if os.path.normcase(name) in present)
+        return existing
+    
     def _load_config_file(self, config_file: str) -> Optional[Dict[str, Any]]:
         """Cargar archivo de configuración"""
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                if config_file.endswith(('.yaml', '.yml')):
+            if config_file.endswith(('.yaml', '.yml')):
+                with open(config_file, 'rb') as f:
                     try:
-                        import yaml
-                        return yaml.safe_load(f)
+                        return self._load_yaml_cached(config_file, f)
                     except ImportError:
                         self.logger.error("PyYAML no está instalado, no se puede cargar archivo YAML")
                         return None
-                else:
+            else:
+                with open(config_file, 'r', encoding='utf-8') as f:
                     return json.load(f)
         except Exception as e:
             self.logger.error(f"Error leyendo archivo de configuración {config_file}: {e}")
             return None
     
+    def _load_yaml_cached(self, config_file: str, f) -> Optional[Dict[str, Any]]:
+        """
+        Cargar YAML evitando parsearlo de nuevo siempre que sea posible
+        
+        Dentro del proceso se reutiliza el último resultado de cada archivo si
+        el hash del contenido no cambió. Entre procesos se usa una caché JSON
+        junto al archivo (<archivo>.cache.json), validada con (mtime_ns,
+        tamaño); si no coincide o no se puede leer, se parsea el YAML y se
+        reescribe la caché. Se usa JSON y no pickle para que un archivo de caché
+        ajeno no pueda ejecutar código al cargarse. Se devuelve siempre una
+        copia, ya que el resultado se fusiona en la configuración y puede
+        modificarse con set().
+        """
+        raw = f.read()
+        digest = hashlib.blake2b(raw, digest_size=16).digest()
+        path_key = os.path.abspath(config_file)
+        cached = _PARSE_CACHE.get(path_key)
+        if cached is not None and cached[0] == digest:
+            return copy.deepcopy(cached[1])
+        
+        stat = os.fstat(f.fileno())
+        signature = [stat.st_mtime_ns, stat.st_size]
+        cache_file = config_file + _YAML_CACHE_SUFFIX
+        
+        try:
+            with open(cache_file, 'rb') as cache:
+                cached_file = _loads_json(cache.read())
+            if cached_file['signature'] == signature:
+                data = cached_file['data']
+                _PARSE_CACHE[path_key] = (digest, data)
+                return copy.deepcopy(data)
+        except Exception:
+            pass  # Caché inexistente, corrupta o desactualizada
+        
+        yaml, loader, _ = _get_yaml()
+        data = yaml.load(raw, Loader=loader)
+        _PARSE_CACHE[path_key] = (digest, data)
+        
+        try:
+            serialized = _dumps_json({'signature': signature, 'data': data})
+            # Solo se cachea si JSON conserva los datos tal cual (sin fechas,
+            # claves no str, etc.); si no, se parseará el YAML la próxima vez
+            if _loads_json(serialized)['data'] == data:
+                tmp_file = cache_file + '.tmp'
+                with open(tmp_file, 'wb') as cache:
+                    cache.write(serialized)
+                os.replace(tmp_file, cache_file)  # Reemplazo atómico
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.debug(f"No se pudo escribir la caché de configuración {cache_file}: {e}")
+        
+        return copy.deepcopy(data)
+    
     def _merge_configs(self, base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
-        """Fusionar configuraciones recursivamente"""
-        result = base.copy()
+        """Fusionar override sobre base (modifica base en el lugar y la devuelve)"""
+        stack = [(base, override)]
         
-        for key, value in override.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._merge_configs(result[key], value)
-            else:
-                result[key] = value
+        while stack:
+            current, changes = stack.pop()
+            for key, value in changes.items():
+                existing = current.get(key)
+                if isinstance(existing, dict) and isinstance(value, (dict, MappingProxyType)):
+                    stack.append((existing, value))
+                else:
+                    # Las vistas de get() se guardan como dict/list para que la
+                    # configuración siga siendo navegable y serializable
+                    current[key] = _thaw(value)
         
-        return result
+        return base
     
     def _load_env_overrides(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Cargar overrides desde variables de entorno"""
-        env_mappings = {
-            'WEBFUZZING_API_KEY': ('api', 'api_key'),
-            'WEBFUZZING_API_HOST': ('api', 'host'),
-            'WEBFUZZING_API_PORT': ('api', 'port'),
-            'WEBFUZZING_WEB_HOST': ('web', 'host'),
-            'WEBFUZZING_WEB_PORT': ('web', 'port'),
-            'WEBFUZZING_DB_PATH': ('database', 'path'),
-            'WEBFUZZING_DEBUG': ('system', 'debug'),
-            'WEBFUZZING_LOG_LEVEL': ('logging', 'level'),
-            'WEBFUZZING_TELEGRAM_TOKEN': ('notifications', 'telegram', 'bot_token'),
-            'WEBFUZZING_TELEGRAM_CHAT_IDS': ('notifications', 'telegram', 'chat_ids'),
-        }
+        # Una sola pasada por el entorno; lo habitual es que no haya ninguna variable
+        env_vars = [name for name in os.environ if name.startswith(_ENV_PREFIX)]
+        if not env_vars:
+            return config
         
-        for env_var, config_path in env_mappings.items():
-            env_value = os.getenv(env_var)
-            if env_value:
+        for env_var in env_vars:
+            mapping = _ENV_MAPPINGS.get(env_var)
+            env_value = os.environ[env_var]
+            if mapping and env_value:
+                config_path, converter = mapping
                 try:
                     # Navegar al nivel correcto de la configuración
                     current = config
@@ -208,17 +405,8 @@ class Config:
                             current[key] = {}
                         current = current[key]
                     
-                    # Convertir tipos apropiados
-                    final_key = config_path[-1]
-                    if env_var.endswith('_PORT'):
-                        current[final_key] = int(env_value)
-                    elif env_var.endswith('_DEBUG'):
-                        current[final_key] = env_value.lower() in ('true', '1', 'yes', 'on')
-                    elif env_var.endswith('_CHAT_IDS'):
-                        current[final_key] = env_value.split(',')
-                    else:
-                        current[final_key] = env_value
-                        
+                    current[config_path[-1]] = converter(env_value)
+                    
                     self.logger.info(f"Override de configuración desde {env_var}")
                     
                 except Exception as e:
@@ -235,23 +423,58 @@ class Config:
             default: Valor por defecto
             
         Returns:
-            Valor de configuración o default
+            Valor de configuración o default. Las secciones y listas se devuelven
+            como vistas de solo lectura (MappingProxyType / tuple); para
+            modificarlas usar set()
         """
         try:
-            keys = key.split('.')
-            value = self.config
-            
-            for k in keys:
-                if isinstance(value, dict) and k in value:
-                    value = value[k]
-                else:
-                    return default
-            
-            return value
-            
+            value = self._get_cache.get(key, _UNCACHED)
+            if value is _UNCACHED:
+                value = self._get_cache[key] = _freeze(self._resolve(key))
         except Exception as e:
             self.logger.warning(f"Error obteniendo configuración {key}: {e}")
             return default
+        
+        return default if value is _MISSING else value
+    
+    def snapshot(self) -> ConfigSnapshot:
+        """
+        Instantánea inmutable de los valores de fuzzing
+        
+        Se construye una vez y se guarda en la caché de get, por lo que se
+        regenera tras set() o reload(). Pensada para leerse por atributo en
+        los bucles de peticiones en lugar de llamar a get() por URL.
+        """
+        snap = self._get_cache.get(_SNAPSHOT_KEY)
+        if snap is None:
+            get = self.get
+            snap = self._get_cache[_SNAPSHOT_KEY] = ConfigSnapshot(
+                timeout=get('fuzzing.timeout'),
+                max_workers=get('fuzzing.max_workers'),
+                user_agent=get('fuzzing.user_agent'),
+                retry_count=get('fuzzing.retry_count'),
+                delay=get('fuzzing.delay_between_requests'),
+                status_codes=get('fuzzing.status_codes_of_interest'),
+                critical_paths=get('fuzzing.critical_paths'),
+                verify_ssl=get('fuzzing.verify_ssl', True)
+            )
+        return snap
+    
+    def _resolve(self, key: str) -> Any:
+        """Recorrer la configuración según una clave en notación punto"""
+        keys = _SPLIT_KEYS.get(key)
+        if keys is None:
+            keys = _SPLIT_KEYS[key] = tuple(sys.intern(k) for k in key.split('.'))
+        
+        value = self.config
+        for k in keys:
+            if not isinstance(value, dict):
+                return _MISSING
+            value = value.get(k, _MISSING)
+            if value is _MISSING:
+                return _MISSING
+        
+        return value
     
     def set(self, key: str, value: Any) -> None:
         """
@@ -262,6 +485,7 @@ class Config:
             value: Valor a establecer
         """
         try:
+            self._get_cache.clear()
             keys = key.split('.')
             current = self.config
             
@@ -271,8 +495,9 @@ class Config:
                     current[k] = {}
                 current = current[k]
             
-            # Establecer el valor final
-            current[keys[-1]] = value
+            # Establecer el valor final (las vistas de get() vuelven a dict/list)
+            current[keys[-1]] = _thaw(value)
+            self._dirty.add(key)
             
         except Exception as e:
             self.logger.error(f"Error estableciendo configuración {key}: {e}")
@@ -290,26 +515,36 @@ class Config:
         if not config_file:
             config_file = 'config.json'
         
+        # Sin cambios desde la carga: el archivo de origen ya está al día
+        if not self._dirty and self._is_source_file(config_file):
+            self.logger.debug(f"Configuración sin cambios, no se reescribe {config_file}")
+            return True
+        
         try:
             # Crear directorio si no existe
             config_dir = os.path.dirname(os.path.abspath(config_file))
             if config_dir and not os.path.exists(config_dir):
                 os.makedirs(config_dir, exist_ok=True)
             
+            # Invalidar la caché JSON del YAML que se va a sobrescribir
+            if os.path.exists(config_file + _YAML_CACHE_SUFFIX):
+                os.remove(config_file + _YAML_CACHE_SUFFIX)
+            
             # Guardar configuración
-            with open(config_file, 'w', encoding='utf-8') as f:
-                if config_file.endswith(('.yaml', '.yml')):
+            if config_file.endswith(('.yaml', '.yml')):
+                with open(config_file, 'w', encoding='utf-8') as f:
                     try:
-                        import yaml
-                        yaml.safe_dump(self.config, f, default_flow_style=False, indent=2)
+                        yaml, _, dumper = _get_yaml()
+                        yaml.dump(self.config, f, Dumper=dumper, default_flow_style=False, indent=2)
                     except ImportError:
                         self.logger.error("PyYAML no está instalado, guardando como JSON")
                         config_file = config_file.replace('.yaml', '.json').replace('.yml', '.json')
-                        with open(config_file, 'w', encoding='utf-8') as json_f:
-                            json.dump(self.config, json_f, indent=2)
-                else:
-                    json.dump(self.config, f, indent=2)
+                        _write_json(self.config, config_file)
+            else:
+                _write_json(self.config, config_file)
             
+            self._dirty.clear()
+            self._source_file = config_file
             self.logger.info(f"Configuración guardada en: {config_file}")
             return True
             
@@ -317,6 +552,13 @@ class Config:
             self.logger.error(f"Error guardando configuración: {e}")
             return False
     
+    def _is_source_file(self, config_file: str) -> bool:
+        """Indicar si config_file es el archivo del que se cargó la configuración"""
+        try:
+            return bool(self._source_file) and os.path.samefile(config_file, self._source_file)
+        except OSError:
+            return False
+    
     def reload(self) -> bool:
         """
         Recargar configuración desde archivos
@@ -326,6 +568,7 @@ class Config:
         """
         try:
             self.config = self._load_config()
+            self._get_cache.clear()
             self.logger.info("Configuración recargada")
             return True
         except Exception as e:
@@ -396,6 +639,23 @@ class Config:
         
         return results
     
+    @cached_property
+    def base_dir(self) -> Path:
+        """Directorio raíz del proyecto (asignable, p. ej. en pruebas)"""
+        return BASE_DIR
+    
+    def get_domains_file(self) -> Path:
+        """Ruta del CSV de dominios"""
+        return self.base_dir / self.get('files.domains_file', 'data/dominios.csv')
+    
+    def get_dictionaries_dir(self) -> Path:
+        """Directorio de diccionarios"""
+        return self.base_dir / self.get('files.dictionaries_dir', 'data/diccionarios')
+    
+    def get_results_dir(self) -> Path:
+        """Directorio de resultados"""
+        return self.base_dir / self.get('files.results_dir', 'data/resultados')
+    
     def get_summary(self) -> Dict[str, Any]:
         """Obtener resumen de configuración"""
         return {
@@ -421,10 +681,7 @@ class Config:
             bool: True si se exportó exitosamente
         """
         try:
-            template = self.default_config.copy()
-            
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(template, f, indent=2)
+            _write_json(self.default_config, output_file)
             
             self.logger.info(f"Plantilla de configuración exportada: {output_file}")
             return True
@@ -435,13 +692,17 @@ class Config:
 
 # Instancia global de configuración
 _config_instance = None
+_config_lock = threading.Lock()
 
 def get_config(config_file: Optional[str] = None) -> Config:
     """Obtener instancia global de configuración"""
     global _config_instance
     
+    # Doble verificación: el lock solo se toma mientras no exista la instancia
     if _config_instance is None:
-        _config_instance = Config(config_file)
+        with _config_lock:
+            if _config_instance is None:
+                _config_instance = Config(config_file)
     
     return _config_instance
 
@@ -449,8 +710,9 @@ def reload_config() -> bool:
     """Recargar configuración global"""
     global _config_instance
     
-    if _config_instance:
-        return _config_instance.reload()
-    else:
-        _config_instance = Config()
-        return True
\ No newline at end of file
+    with _config_lock:
+        if _config_instance:
+            return _config_instance.reload()
+        else:
+            _config_instance = Config()
+            return True
@@ -1,15 +1,161 @@
 # core/bruteforce_generator.py
+import os
 import itertools
 import string
 import random
-import threading
+import functools
 from typing import List, Set, Iterator, Dict, Any
 import time
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor
 
 from utils.logger import get_logger
 
+# Patrones comunes para aplicaciones web: (base, sufijos)
+_COMMON_PATTERNS = (
+    # Patrones administrativos
+    ('admin', ('', '1', '2', '_panel', '_area')),
+    ('panel', ('', '_admin', '_control', '_user')),
+    ('control', ('', '_panel', '_admin')),
+    
+    # Patrones de desarrollo
+    ('dev', ('', '_test', '_stage', '_prod')),
+    ('test', ('', '_dev', '_stage', '_env')),
+    ('stage', ('', '_test', '_dev', '_prod')),
+    
+    # Patrones de API
+    ('api', ('', '_v1', '_v2', '_test', '_dev')),
+    ('v1', ('', '_api', '_test')),
+    ('v2', ('', '_api', '_test')),
+    
+    # Patrones de backup
+    ('backup', ('', '_old', '_new', '_temp')),
+    ('old', ('', '_backup', '_temp')),
+    ('temp', ('', '_backup', '_old')),
+)
+
+# Sufijos para los patrones proporcionados y extensiones de cada variación
+_USER_PATTERN_SUFFIXES = ('', '1', '2')
+_PATTERN_EXTENSIONS = ('.php', '.html', '.asp', '.jsp')
+
+def _expand_patterns(patterns) -> Iterator[str]:
+    """Expandir (base, sufijos) en base+sufijo seguido de sus variaciones con extensión"""
+    for base, suffixes in patterns:
+        for suffix in suffixes:
+            path = base + suffix
+            yield path
+            for ext in _PATTERN_EXTENSIONS:
+                yield path + ext
+
+# Patrones comunes ya expandidos (se calculan una vez al importar el módulo)
+_COMMON_EXPANDED = tuple(_expand_patterns(_COMMON_PATTERNS))
+
+# Prefijos, sufijos, separadores y números para combinaciones inteligentes
+_SMART_PREFIXES = ('', 'new_', 'old_', 'tmp_', 'test_', 'dev_', 'admin_')
+_SMART_SUFFIXES = ('', '_new', '_old', '_tmp', '_test', '_dev', '_admin', '_backup')
+_SMART_SEPARATORS = ('', '-', '_', '.')
+_SMART_NUMBERS = ('', '1', '2', '3', '01', '02', '03', '2023', '2024', '2025')
+
+# Cada combinación (limitada a 5 prefijos, 5 sufijos, 3 separadores y 5 números)
+# ya resuelta como (antes de la palabra, después de la palabra, ruta sin palabra):
+# equivale a separator.join(filter(None, [prefix, word, suffix, num]))
+_SMART_AFFIXES = tuple(
+    (
+        prefix + separator if prefix else '',
+        (separator + suffix if suffix else '') + (separator + num if num else ''),
+        separator.join(filter(None, (prefix, suffix, num)))
+    )
+    for prefix, suffix, separator, num in itertools.product(
+        _SMART_PREFIXES[:5], _SMART_SUFFIXES[:5], _SMART_SEPARATORS[:3], _SMART_NUMBERS[:5]
+    )
+)
+
+# Tecnologías y frameworks comunes
+_TECHNOLOGIES = (
+    'php', 'asp', 'jsp', 'python', 'node', 'ruby',
+    'wordpress', 'joomla', 'drupal', 'laravel', 'symfony',
+    'react', 'angular', 'vue', 'bootstrap', 'jquery',
+    'mysql', 'postgres', 'mongodb', 'redis', 'elastic',
+    'apache', 'nginx', 'tomcat', 'iis', 'docker'
+)
+
+# Sufijos relacionados con tecnologías
+_TECH_SUFFIXES = (
+    '', '_config', '_admin', '_panel', '_test', '_dev',
+    '_backup', '_log', '_data', '_cache', '_tmp'
+)
+
+def _build_tech_paths() -> tuple:
+    """Tecnología+sufijo, seguida de su variación con la extensión propia de la tecnología"""
+    paths = []
+    for tech in _TECHNOLOGIES:
+        tech_lower = tech.lower()
+        if 'php' in tech_lower:
+            tech_ext = '.php'
+        elif 'asp' in tech_lower:
+            tech_ext = '.asp'
+        elif 'jsp' in tech_lower:
+            tech_ext = '.jsp'
+        else:
+            tech_ext = None
+        
+        for suffix in _TECH_SUFFIXES:
+            path = tech + suffix
+            paths.append(path)
+            if tech_ext:
+                paths.append(path + tech_ext)
+    
+    return tuple(paths)
+
+# Rutas tecnológicas completas (se calculan una vez al importar el módulo)
+_TECH_PATHS = _build_tech_paths()
+
+# Rangos numéricos comunes: [inicio, fin)
+_NUMERIC_RANGES = (
+    (1, 11),      # 1-10
+    (1, 101),     # 1-100
+    (2020, 2026), # Años recientes
+    (80, 8081),   # Puertos comunes
+)
+
+# Formatos de fecha comunes: prefijos por año y formatos por (año, mes)
+_YEAR_PREFIXES = ('backup_', 'log_', 'data_')
+_MONTH_FORMATS = ('%d%02d', '%d_%02d', 'backup_%d%02d', 'log_%d_%02d')
+
+@functools.lru_cache(maxsize=1)
+def _date_paths(current_year: int) -> tuple:
+    """Rutas de fechas para los años cercanos a current_year (se calculan una vez por año)"""
+    paths = []
+    for year in range(current_year - 3, current_year + 2):
+        year_str = str(year)
+        paths.append(year_str)
+        paths.append(year_str[-2:])  # Año corto
+        paths.extend(prefix + year_str for prefix in _YEAR_PREFIXES)
+        
+        for month in range(1, 13):
+            year_month = (year, month)
+            paths.extend(fmt % year_month for fmt in _MONTH_FORMATS)
+    
+    return tuple(paths)
+
+# Líneas agregadas a successful_patterns.txt antes de reescribirlo compactado
+_PATTERNS_COMPACT_THRESHOLD = 1024
+
+def _add_bounded(target: Set[str], paths, max_size: int) -> int:
+    """
+    Agregar rutas a target sin superar max_size
+    
+    Se consume por tramos del tamaño del hueco restante (set.update en C) y
+    se deja de leer en cuanto el conjunto está lleno. Devuelve las rutas nuevas.
+    """
+    before = len(target)
+    iterator = iter(paths)
+    while len(target) < max_size:
+        chunk = list(itertools.islice(iterator, max_size - len(target)))
+        if not chunk:
+            break
+        target.update(chunk)
+    return len(target) - before
+
 class BruteforceGenerator:
     """Generador inteligente de rutas por fuerza bruta"""
     
@@ -33,108 +179,59 @@ class BruteforceGenerator:
         
         # Cache de patrones exitosos
         self.successful_patterns = set()
+        self._appended_patterns = 0
         self.load_successful_patterns()
     
     def generate_sequential(self, charset: str, length: int, max_count: int = 1000) -> Iterator[str]:
         """Generar rutas secuenciales con charset específico"""
+        # Corte y unión en C (islice + map) en lugar de contar en el bucle
+        combinations = itertools.islice(itertools.product(charset, repeat=length), max_count)
         count = 0
-        for combination in itertools.product(charset, repeat=length):
-            if count >= max_count:
-                break
-            
-            path = ''.join(combination)
-            yield path
-            count += 1
-            self.stats['total_generated'] += 1
+        try:
+            for count, path in enumerate(map(''.join, combinations), 1):
+                yield path
+        finally:
+            # También si el consumidor abandona el generador antes de agotarlo
+            self.stats['total_generated'] += count
     
     def generate_random(self, charset: str, length: int, count: int) -> List[str]:
         """Generar rutas aleatorias"""
-        paths = []
-        for _ in range(count):
-            path = ''.join(random.choices(charset, k=length))
-            paths.append(path)
-            self.stats['total_generated'] += 1
+        if length <= 0:
+            paths = [''] * max(count, 0)
+        else:
+            # Un solo sorteo de length*count caracteres, cortado en rutas de longitud fija
+            chars = ''.join(random.choices(charset, k=length * max(count, 0)))
+            paths = [chars[i:i + length] for i in range(0, len(chars), length)]
         
+        self.stats['total_generated'] += len(paths)
         return paths
     
     def generate_pattern_based(self, patterns: List[str], max_count: int = 500) -> List[str]:
         """Generar rutas basadas en patrones conocidos"""
-        paths = []
+        # Primero los patrones comunes (ya expandidos) y luego los proporcionados
+        paths = list(_COMMON_EXPANDED[:max_count])
         
-        # Patrones comunes para aplicaciones web
-        common_patterns = [
-            # Patrones administrativos
-            ('admin', ['', '1', '2', '_panel', '_area']),
-            ('panel', ['', '_admin', '_control', '_user']),
-            ('control', ['', '_panel', '_admin']),
-            
-            # Patrones de desarrollo
-            ('dev', ['', '_test', '_stage', '_prod']),
-            ('test', ['', '_dev', '_stage', '_env']),
-            ('stage', ['', '_test', '_dev', '_prod']),
-            
-            # Patrones de API
-            ('api', ['', '_v1', '_v2', '_test', '_dev']),
-            ('v1', ['', '_api', '_test']),
-            ('v2', ['', '_api', '_test']),
-            
-            # Patrones de backup
-            ('backup', ['', '_old', '_new', '_temp']),
-            ('old', ['', '_backup', '_temp']),
-            ('temp', ['', '_backup', '_old']),
-        ]
-        
-        # Combinar patrones base con patrones proporcionados
-        all_patterns = common_patterns + [(p, ['', '1', '2']) for p in patterns]
-        
-        for base, suffixes in all_patterns:
-            if len(paths) >= max_count:
-                break
-                
-            for suffix in suffixes:
-                path = base + suffix
-                paths.append(path)
-                
-                # Agregar variaciones con extensiones
-                for ext in ['.php', '.html', '.asp', '.jsp']:
-                    if len(paths) >= max_count:
-                        break
-                    paths.append(path + ext)
+        if len(paths) < max_count:
+            user_patterns = ((p, _USER_PATTERN_SUFFIXES) for p in patterns)
+            paths.extend(itertools.islice(_expand_patterns(user_patterns), max_count - len(paths)))
         
         self.stats['total_generated'] += len(paths)
         return paths
     
     def generate_smart_combinations(self, base_words: List[str], max_count: int = 1000) -> List[str]:
         """Generar combinaciones inteligentes basadas en palabras base"""
-        paths = []
-        
-        # Prefijos y sufijos comunes
-        prefixes = ['', 'new_', 'old_', 'tmp_', 'test_', 'dev_', 'admin_']
-        suffixes = ['', '_new', '_old', '_tmp', '_test', '_dev', '_admin', '_backup']
-        separators = ['', '-', '_', '.']
-        
-        # Números comunes
-        numbers = ['', '1', '2', '3', '01', '02', '03', '2023', '2024', '2025']
-        
-        count = 0
-        for word in base_words[:20]:  # Limitar palabras base
-            if count >= max_count:
-                break
-                
-            for prefix in prefixes[:5]:  # Limitar prefijos
-                for suffix in suffixes[:5]:  # Limitar sufijos
-                    for separator in separators[:3]:  # Limitar separadores
-                        for num in numbers[:5]:  # Limitar números
-                            if count >= max_count:
-                                break
-                            
-                            # Generar combinación
-                            parts = [prefix, word, suffix, num]
-                            path = separator.join(filter(None, parts))
-                            
-                            if path and path != word:  # Evitar duplicados exactos
-                                paths.append(path)
-                                count += 1
+        def combinations() -> Iterator[str]:
+            for word in base_words[:20]:  # Limitar palabras base
+                if word:
+                    for head, tail, _ in _SMART_AFFIXES:
+                        if head or tail:  # Evitar duplicados exactos de la palabra
+                            yield head + word + tail
+                else:
+                    for _, _, path in _SMART_AFFIXES:
+                        if path:
+                            yield path
+        
+        paths = list(itertools.islice(combinations(), max_count))
         
         self.stats['total_generated'] += len(paths)
         return paths
@@ -142,124 +239,68 @@ class BruteforceGenerator:
     def generate_numeric_sequences(self, max_count: int = 200) -> List[str]:
         """Generar secuencias numéricas comunes"""
         paths = []
+        per_range = max_count // len(_NUMERIC_RANGES)
         
-        # Rangos numéricos comunes
-        ranges = [
-            (1, 11),      # 1-10
-            (1, 101),     # 1-100
-            (2020, 2026), # Años recientes
-            (80, 8081),   # Puertos comunes
-        ]
-        
-        for start, end in ranges:
-            for i in range(start, min(end, start + max_count // len(ranges))):
-                paths.append(str(i))
-                
-                # Agregar variaciones con ceros
-                if i < 100:
-                    paths.append(f"{i:02d}")
-                if i < 1000:
-                    paths.append(f"{i:03d}")
+        for start, end in _NUMERIC_RANGES:
+            end = min(end, start + per_range)
+            
+            # Cada número seguido de sus variaciones con ceros (02d si < 100, 03d si < 1000),
+            # formateando cada tramo con map en lugar de un bucle por número
+            two_digits = range(start, max(start, min(end, 100)))
+            three_digits = range(max(start, 100), max(start, min(end, 1000)))
+            plain = range(max(start, 1000), end)
+            
+            paths.extend(itertools.chain.from_iterable(zip(
+                map(str, two_digits), map('%02d'.__mod__, two_digits), map('%03d'.__mod__, two_digits)
+            )))
+            paths.extend(itertools.chain.from_iterable(zip(
+                map(str, three_digits), map('%03d'.__mod__, three_digits)
+            )))
+            paths.extend(map(str, plain))
         
         self.stats['total_generated'] += len(paths)
         return paths
     
     def generate_date_based(self, max_count: int = 100) -> List[str]:
         """Generar rutas basadas en fechas"""
-        paths = []
-        current_year = datetime.now().year
-        
-        # Formatos de fecha comunes
-        for year in range(current_year - 3, current_year + 2):
-            paths.extend([
-                str(year),
-                str(year)[-2:],  # Año corto
-                f"backup_{year}",
-                f"log_{year}",
-                f"data_{year}"
-            ])
-            
-            for month in range(1, 13):
-                if len(paths) >= max_count:
-                    break
-                    
-                paths.extend([
-                    f"{year}{month:02d}",
-                    f"{year}_{month:02d}",
-                    f"backup_{year}{month:02d}",
-                    f"log_{year}_{month:02d}"
-                ])
+        paths = list(_date_paths(datetime.now().year)[:max_count])
         
         self.stats['total_generated'] += len(paths)
-        return paths[:max_count]
+        return paths
     
     def generate_technology_based(self, max_count: int = 300) -> List[str]:
         """Generar rutas basadas en tecnologías comunes"""
-        paths = []
-        
-        # Tecnologías y frameworks comunes
-        technologies = [
-            'php', 'asp', 'jsp', 'python', 'node', 'ruby',
-            'wordpress', 'joomla', 'drupal', 'laravel', 'symfony',
-            'react', 'angular', 'vue', 'bootstrap', 'jquery',
-            'mysql', 'postgres', 'mongodb', 'redis', 'elastic',
-            'apache', 'nginx', 'tomcat', 'iis', 'docker'
-        ]
-        
-        # Sufijos relacionados con tecnologías
-        tech_suffixes = [
-            '', '_config', '_admin', '_panel', '_test', '_dev',
-            '_backup', '_log', '_data', '_cache', '_tmp'
-        ]
-        
-        for tech in technologies:
-            if len(paths) >= max_count:
-                break
-                
-            for suffix in tech_suffixes:
-                if len(paths) >= max_count:
-                    break
-                    
-                path = tech + suffix
-                paths.append(path)
-                
-                # Agregar extensiones relacionadas
-                if 'php' in tech.lower():
-                    paths.append(path + '.php')
-                elif 'asp' in tech.lower():
-                    paths.append(path + '.asp')
-                elif 'jsp' in tech.lower():
-                    paths.append(path + '.jsp')
+        paths = list(_TECH_PATHS[:max_count])
         
         self.stats['total_generated'] += len(paths)
-        return paths[:max_count]
+        return paths
     
     def generate_multilength_alphabetic(self, min_length: int = 3, 
                                       max_length: int = 8, 
                                       max_total: int = 2000) -> List[str]:
         """Generar rutas alfabéticas de múltiples longitudes"""
         paths = []
-        paths_per_length = max_total // (max_length - min_length + 1)
+        lengths = range(min_length, max_length + 1)
+        if not lengths:
+            return paths
+        
+        paths_per_length = max_total // len(lengths)
+        # Solo letras minúsculas para eficiencia
+        charset = string.ascii_lowercase
         
-        for length in range(min_length, min_length + 1):
-            # Solo letras minúsculas para eficiencia
-            charset = string.ascii_lowercase
+        for length in lengths:
+            budget = min(paths_per_length, max_total - len(paths))
+            if budget <= 0:
+                break
             
             if length <= 4:
                 # Para longitudes pequeñas, usar generación secuencial
-                for path in self.generate_sequential(charset, length, paths_per_length):
-                    paths.append(path)
-                    if len(paths) >= max_total:
-                        break
+                paths.extend(self.generate_sequential(charset, length, budget))
             else:
                 # Para longitudes mayores, usar generación aleatoria
-                random_paths = self.generate_random(charset, length, paths_per_length)
-                paths.extend(random_paths)
-            
-            if len(paths) >= max_total:
-                break
+                paths.extend(self.generate_random(charset, length, budget))
         
-        return paths[:max_total]
+        return paths
     
     def generate_comprehensive_wordlist(self, max_size: int = 5000, 
                                       base_words: List[str] = None) -> List[str]:
@@ -276,38 +317,41 @@ class BruteforceGenerator:
                 list(self.successful_patterns), 
                 max_count=min(1000, max_size // 6)
             )
-            all_paths.update(pattern_paths)
-            self.logger.info(f"Patrones exitosos: {len(pattern_paths)} rutas")
+            added = _add_bounded(all_paths, pattern_paths, max_size)
+            self.logger.info(f"Patrones exitosos: {added} rutas")
         
         # 2. Combinaciones inteligentes con palabras base
-        if base_words:
+        if base_words and len(all_paths) < max_size:
             smart_paths = self.generate_smart_combinations(
                 base_words, 
                 max_count=min(1500, max_size // 4)
             )
-            all_paths.update(smart_paths)
-            self.logger.info(f"Combinaciones inteligentes: {len(smart_paths)} rutas")
+            added = _add_bounded(all_paths, smart_paths, max_size)
+            self.logger.info(f"Combinaciones inteligentes: {added} rutas")
         
         # 3. Rutas basadas en tecnologías
-        tech_paths = self.generate_technology_based(
-            max_count=min(800, max_size // 6)
-        )
-        all_paths.update(tech_paths)
-        self.logger.info(f"Rutas tecnológicas: {len(tech_paths)} rutas")
+        if len(all_paths) < max_size:
+            tech_paths = self.generate_technology_based(
+                max_count=min(800, max_size // 6)
+            )
+            added = _add_bounded(all_paths, tech_paths, max_size)
+            self.logger.info(f"Rutas tecnológicas: {added} rutas")
         
         # 4. Secuencias numéricas
-        numeric_paths = self.generate_numeric_sequences(
-            max_count=min(300, max_size // 15)
-        )
-        all_paths.update(numeric_paths)
-        self.logger.info(f"Secuencias numéricas: {len(numeric_paths)} rutas")
+        if len(all_paths) < max_size:
+            numeric_paths = self.generate_numeric_sequences(
+                max_count=min(300, max_size // 15)
+            )
+            added = _add_bounded(all_paths, numeric_paths, max_size)
+            self.logger.info(f"Secuencias numéricas: {added} rutas")
         
         # 5. Rutas basadas en fechas
-        date_paths = self.generate_date_based(
-            max_count=min(200, max_size // 20)
-        )
-        all_paths.update(date_paths)
-        self.logger.info(f"Rutas de fechas: {len(date_paths)} rutas")
+        if len(all_paths) < max_size:
+            date_paths = self.generate_date_based(
+                max_count=min(200, max_size // 20)
+            )
+            added = _add_bounded(all_paths, date_paths, max_size)
+            self.logger.info(f"Rutas de fechas: {added} rutas")
         
         # 6. Si aún hay espacio, agregar rutas alfabéticas
         remaining_space = max_size - len(all_paths)
@@ -317,16 +361,13 @@ class BruteforceGenerator:
                 max_length=min(6, self.max_length),
                 max_total=remaining_space
             )
-            all_paths.update(alpha_paths)
-            self.logger.info(f"Rutas alfabéticas: {len(alpha_paths)} rutas")
+            added = _add_bounded(all_paths, alpha_paths, max_size)
+            self.logger.info(f"Rutas alfabéticas: {added} rutas")
         
-        # Convertir a lista y mezclar
+        # Convertir a lista y mezclar (el conjunto ya está limitado a max_size)
         final_paths = list(all_paths)
         random.shuffle(final_paths)
         
-        # Limitar al tamaño máximo
-        final_paths = final_paths[:max_size]
-        
         # Actualizar estadísticas
         self.stats['generation_time'] = time.time() - self.stats['start_time']
         
@@ -340,26 +381,51 @@ class BruteforceGenerator:
         # Extraer patrón base (sin extensión)
         base_pattern = pattern.split('.')[0]
         
-        # Agregar variaciones del patrón
-        self.successful_patterns.add(base_pattern)
-        
-        # Agregar palabras individuales si el patrón contiene separadores
+        # Variaciones del patrón y palabras individuales si contiene separadores
+        candidates = {base_pattern}
         for separator in ['_', '-', '.']:
             if separator in base_pattern:
-                parts = base_pattern.split(separator)
-                self.successful_patterns.update(parts)
+                candidates.update(base_pattern.split(separator))
+        
+        new_patterns = candidates - self.successful_patterns
+        if new_patterns:
+            self.successful_patterns.update(new_patterns)
+            self._append_successful_patterns(new_patterns)
         
-        self.save_successful_patterns()
         self.logger.info(f"Patrón marcado como exitoso: {pattern}")
     
+    def _append_successful_patterns(self, patterns: Set[str]):
+        """Agregar solo los patrones nuevos al archivo, compactándolo cada cierto tiempo"""
+        lines = [p for p in patterns if p]
+        if not lines:
+            return
+        
+        if self._appended_patterns + len(lines) > _PATTERNS_COMPACT_THRESHOLD:
+            self.save_successful_patterns()
+            return
+        
+        try:
+            patterns_file = self.config.base_dir / 'data' / 'successful_patterns.txt'
+            
+            with open(patterns_file, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+            self._appended_patterns += len(lines)
+            
+        except Exception as e:
+            self.logger.warning(f"Error guardando patrones exitosos: {e}")
+    
     def save_successful_patterns(self):
-        """Guardar patrones exitosos en archivo"""
+        """Guardar patrones exitosos en archivo (reescritura completa y atómica)"""
         try:
             patterns_file = self.config.base_dir / 'data' / 'successful_patterns.txt'
+            tmp_file = patterns_file.with_name(patterns_file.name + '.tmp')
             
-            with open(patterns_file, 'w', encoding='utf-8') as f:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
                 for pattern in sorted(self.successful_patterns):
                     f.write(pattern + '\n')
+            
+            os.replace(tmp_file, patterns_file)
+            self._appended_patterns = 0
                     
         except Exception as e:
             self.logger.warning(f"Error guardando patrones exitosos: {e}")
@@ -370,10 +436,10 @@ class BruteforceGenerator:
             patterns_file = self.config.base_dir / 'data' / 'successful_patterns.txt'
             
             if patterns_file.exists():
-                with open(patterns_file, 'r', encoding='utf-8') as f:
-                    self.successful_patterns = set(
-                        line.strip() for line in f if line.strip()
-                    )
+                # Una sola lectura y decodificación del archivo completo
+                lines = patterns_file.read_bytes().decode('utf-8').splitlines()
+                self.successful_patterns = {line.strip() for line in lines}
+                self.successful_patterns.discard('')
                 
                 self.logger.info(f"Cargados {len(self.successful_patterns)} patrones exitosos")
                 
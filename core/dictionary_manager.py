@@ -1,5 +1,6 @@
 # core/dictionary_manager.py
 import os
+import heapq
 import requests
 import json
 from pathlib import Path
@@ -240,13 +241,14 @@ class DictionaryManager:
     
     def get_most_successful_paths(self, limit: int = 50) -> List[str]:
         """Obtener las rutas más exitosas"""
-        sorted_paths = sorted(
+        # Selección parcial O(n log k) en lugar de ordenar todas las estadísticas
+        top_paths = heapq.nlargest(
+            limit,
             self.path_stats.items(),
-            key=lambda x: (x[1]['success_rate'], x[1]['successes']),
-            reverse=True
+            key=lambda x: (x[1]['success_rate'], x[1]['successes'])
         )
         
-        return [path for path, _ in sorted_paths[:limit]]
+        return [path for path, _ in top_paths]
     
     def save_stats(self):
         """Guardar estadísticas de uso"""
@@ -331,9 +333,9 @@ class DictionaryManager:
                 
                 prioritized.append((path, priority))
             
-            # Ordenar por prioridad y tomar las mejores
-            prioritized.sort(key=lambda x: x[1], reverse=True)
-            final_paths = [path for path, _ in prioritized[:max_size]]
+            # Tomar las de mayor prioridad sin ordenar la lista completa
+            top_prioritized = heapq.nlargest(max_size, prioritized, key=lambda x: x[1])
+            final_paths = [path for path, _ in top_prioritized]
         
         # Mezclar para mejor distribución
         random.shuffle(final_paths)
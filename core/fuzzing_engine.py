@@ -8,6 +8,7 @@ from urllib.parse import urljoin, urlparse
 from pathlib import Path
 from typing import List, Dict, Any, Tuple, Optional
 import itertools
+import re
 import string
 import random
 from datetime import datetime
@@ -25,14 +26,21 @@ class FuzzingEngine:
         self.db = DatabaseManager(config)
         self.logger = get_logger(__name__)
         
-        # Configuración de fuzzing
-        self.timeout = config.get('fuzzing.timeout')
-        self.max_workers = config.get('fuzzing.max_workers')
-        self.user_agent = config.get('fuzzing.user_agent')
-        self.retry_count = config.get('fuzzing.retry_count')
-        self.delay = config.get('fuzzing.delay_between_requests')
-        self.status_codes = config.get('fuzzing.status_codes_of_interest')
-        self.critical_paths = config.get('fuzzing.critical_paths')
+        # Configuración de fuzzing (una sola instantánea en lugar de un get por valor)
+        settings = config.snapshot()
+        self.timeout = settings.timeout
+        self.max_workers = settings.max_workers
+        self.user_agent = settings.user_agent
+        self.retry_count = settings.retry_count
+        self.delay = settings.delay
+        self.status_codes = settings.status_codes
+        self.critical_paths = settings.critical_paths
+        
+        # Una sola expresión regular para todas las rutas críticas (una pasada por URL)
+        self._critical_re = (
+            re.compile('|'.join(map(re.escape, self.critical_paths)))
+            if self.critical_paths else None
+        )
         
         # Integración con herramientas externas
         self.ffuf = FFUFIntegration(config) if config.get('tools.ffuf.enabled') else None
@@ -155,30 +163,27 @@ class FuzzingEngine:
         # Caracteres a usar
         chars = alphabet + numbers + special_chars
         
-        generated_paths = []
-        
         # Generar combinaciones de diferentes longitudes (de 3 a max_length)
-        for length in range(3, min(max_length + 1, 8)):  # Limitar a 7 para evitar explosión combinatoria
-            # Generar algunas combinaciones aleatorias
-            for _ in range(min(100, 26 ** length)):  # Limitar cantidad
-                path = ''.join(random.choices(chars, k=length))
-                generated_paths.append(path)
-                
-                # Agregar variaciones con extensiones comunes
-                for ext in ['.php', '.html', '.asp', '.jsp', '.txt']:
-                    generated_paths.append(path + ext)
+        # Limitar a 7 para evitar explosión combinatoria y a 100 combinaciones aleatorias por longitud
+        base_paths = [
+            ''.join(random.choices(chars, k=length))
+            for length in range(3, min(max_length + 1, 8))
+            for _ in range(min(100, 26 ** length))
+        ]
+        generated_paths = set(base_paths)
         
-        # Agregar patrones comunes
-        common_patterns = []
-        for word in ['admin', 'test', 'dev', 'api', 'panel']:
-            for suffix in ['', '1', '2', '_old', '_new', '_backup']:
-                common_patterns.append(word + suffix)
-                common_patterns.append(word + suffix + '/')
+        # Agregar variaciones con extensiones comunes
+        generated_paths.update(map(''.join, itertools.product(base_paths, ['.php', '.html', '.asp', '.jsp', '.txt'])))
         
-        generated_paths.extend(common_patterns)
-        
-        # Eliminar duplicados y ordenar
-        unique_paths = list(set(generated_paths))
+        # Agregar patrones comunes
+        generated_paths.update(map(''.join, itertools.product(
+            ['admin', 'test', 'dev', 'api', 'panel'],
+            ['', '1', '2', '_old', '_new', '_backup'],
+            ['', '/']
+        )))
+        
+        # Duplicados ya eliminados por el set
+        unique_paths = list(generated_paths)
         random.shuffle(unique_paths)  # Mezclar para mejor distribución
         
         self.logger.info(f"Generadas {len(unique_paths)} rutas por fuerza bruta")
@@ -207,7 +212,7 @@ class FuzzingEngine:
                     'content_length': len(response.content),
                     'content_type': response.headers.get('content-type', ''),
                     'response_time': response.elapsed.total_seconds(),
-                    'is_critical': any(critical in path.lower() for critical in self.critical_paths)
+                    'is_critical': self._is_critical_path(path)
                 }
                 
                 # Guardar en base de datos
@@ -218,7 +223,8 @@ class FuzzingEngine:
                     status_code=response.status_code,
                     content_length=result['content_length'],
                     content_type=result['content_type'],
-                    response_time=result['response_time']
+                    response_time=result['response_time'],
+                    is_critical=result['is_critical']
                 )
                 
                 self.stats['paths_found'] += 1
@@ -229,15 +235,28 @@ class FuzzingEngine:
                 return result
                 
         except requests.exceptions.Timeout:
-            self.logger.debug(f"Timeout en {url}")
+            # Rama caliente (la mayoría de las URLs fallan): formato diferido para
+            # no construir el mensaje cuando DEBUG está deshabilitado
+            self.logger.debug("Timeout en %s", url)
         except requests.exceptions.ConnectionError:
-            self.logger.debug(f"Error de conexión en {url}")
+            self.logger.debug("Error de conexión en %s", url)
         except Exception as e:
             self.stats['errors'] += 1
-            self.logger.debug(f"Error probando {url}: {e}")
+            self.logger.debug("Error probando %s: %s", url, e)
             
         return None
 
+    def _is_critical_path(self, path: str) -> bool:
+        """Determinar si una ruta contiene alguno de los patrones críticos"""
+        return self._critical_re is not None and self._critical_re.search(path.lower()) is not None
+
+    def _test_url_with_delay(self, url: str, domain_id: int) -> Optional[Dict]:
+        """Probar una URL y pausar el hilo según fuzzing.delay_between_requests"""
+        try:
+            return self.test_single_url(url, domain_id)
+        finally:
+            time.sleep(self.delay)
+
     def fuzz_domain(self, domain: Dict, paths: List[str]) -> List[Dict]:
         """Realizar fuzzing en un dominio específico"""
         self.logger.info(f"Iniciando fuzzing en {domain['base_url']}")
@@ -253,10 +272,14 @@ class FuzzingEngine:
             url = urljoin(domain['base_url'] + '/', path.lstrip('/'))
             urls_to_test.append((url, domain_id))
         
+        # La pausa entre requests se aplica en cada hilo trabajador; dormir en el
+        # bucle colector sólo retrasaba la recogida de resultados ya obtenidos
+        test_url = self._test_url_with_delay if self.delay > 0 else self.test_single_url
+        
         # Ejecutar fuzzing con múltiples hilos
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             future_to_url = {
-                executor.submit(self.test_single_url, url, domain_id): url 
+                executor.submit(test_url, url, domain_id): url 
                 for url, domain_id in urls_to_test
             }
             
@@ -265,10 +288,6 @@ class FuzzingEngine:
                 if result:
                     results.append(result)
                     self.logger.info(f"[{result['status_code']}] {result['url']}")
-                
-                # Pequeña pausa entre requests
-                if self.delay > 0:
-                    time.sleep(self.delay)
         
         self.logger.info(f"Fuzzing completado en {domain['base_url']}: {len(results)} rutas encontradas")
         return results
@@ -335,22 +354,27 @@ class FuzzingEngine:
 
     def generate_report(self, all_results: List[Dict], scan_duration: float) -> str:
         """Generar reporte de resultados"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = datetime.now()  # Un único instante para el nombre y la fecha del reporte
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         report_file = self.config.get_results_dir() / f"reporte_{timestamp}.txt"
         
-        # Agrupar resultados por dominio
+        # Agrupar resultados por dominio, separando críticos y normales en una sola pasada
         results_by_domain = {}
         for result in all_results:
             domain = urlparse(result['url']).netloc
             if domain not in results_by_domain:
-                results_by_domain[domain] = []
-            results_by_domain[domain].append(result)
+                results_by_domain[domain] = ([], [])
+            critical_results, normal_results = results_by_domain[domain]
+            if result.get('is_critical', False):
+                critical_results.append(result)
+            else:
+                normal_results.append(result)
         
         # Generar reporte
         with open(report_file, 'w', encoding='utf-8') as f:
             f.write(f"REPORTE DE FUZZING WEB\n")
             f.write(f"={'=' * 50}\n\n")
-            f.write(f"Fecha: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"Fecha: {now.strftime('%Y-%m-%d %H:%M:%S')}\n")
             f.write(f"Duración: {scan_duration:.2f} segundos\n")
             f.write(f"Requests realizados: {self.stats['requests_made']}\n")
             f.write(f"Rutas encontradas: {self.stats['paths_found']}\n")
@@ -360,26 +384,24 @@ class FuzzingEngine:
             # Resumen por dominio
             f.write("RESUMEN POR DOMINIO\n")
             f.write("-" * 30 + "\n")
-            for domain, results in results_by_domain.items():
-                critical_count = sum(1 for r in results if r.get('is_critical', False))
-                f.write(f"{domain}: {len(results)} rutas ({critical_count} críticas)\n")
+            for domain, (critical_results, normal_results) in results_by_domain.items():
+                total = len(critical_results) + len(normal_results)
+                f.write(f"{domain}: {total} rutas ({len(critical_results)} críticas)\n")
             
             f.write("\n\nRESULTADOS DETALLADOS\n")
             f.write("=" * 50 + "\n\n")
             
-            for domain, results in results_by_domain.items():
+            for domain, (critical_results, normal_results) in results_by_domain.items():
                 f.write(f"\nDOMINIO: {domain}\n")
                 f.write("-" * (len(domain) + 9) + "\n")
                 
                 # Primero las rutas críticas
-                critical_results = [r for r in results if r.get('is_critical', False)]
                 if critical_results:
                     f.write("\n🚨 RUTAS CRÍTICAS:\n")
                     for result in critical_results:
                         f.write(f"  [{result['status_code']}] {result['url']}\n")
                 
                 # Luego las demás rutas
-                normal_results = [r for r in results if not r.get('is_critical', False)]
                 if normal_results:
                     f.write("\n📁 OTRAS RUTAS:\n")
                     for result in normal_results:
@@ -391,6 +413,7 @@ class FuzzingEngine:
     def run_scan(self, domains_file: str = None, output_dir: str = None) -> Dict:
         """Ejecutar escaneo completo"""
         self.stats['start_time'] = time.time()
+        start_perf = time.monotonic()  # Reloj monotónico para medir la duración
         self.logger.info("Iniciando escaneo de fuzzing web")
         
         try:
@@ -420,7 +443,7 @@ class FuzzingEngine:
             
             # Generar reporte
             self.stats['end_time'] = time.time()
-            scan_duration = self.stats['end_time'] - self.stats['start_time']
+            scan_duration = time.monotonic() - start_perf
             report_file = self.generate_report(all_results, scan_duration)
             
             # Estadísticas finales
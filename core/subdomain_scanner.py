@@ -49,7 +49,7 @@ class SubdomainScanner:
             result['ip_addresses'] = [str(answer) for answer in answers]
             
             # Probar conectividad HTTP/HTTPS
-            start_time = time.time()
+            start_time = time.monotonic()
             
             # Probar HTTPS primero
             try:
@@ -71,14 +71,14 @@ class SubdomainScanner:
                 except:
                     pass
             
-            result['response_time'] = time.time() - start_time
+            result['response_time'] = time.monotonic() - start_time
             
         except dns.resolver.NXDOMAIN:
             pass  # Subdominio no existe
         except dns.resolver.NoAnswer:
             pass  # Sin respuesta DNS
         except Exception as e:
-            self.logger.debug(f"Error resolviendo {full_domain}: {e}")
+            self.logger.debug("Error resolviendo %s: %s", full_domain, e)
         
         return result
     
@@ -128,9 +128,6 @@ class SubdomainScanner:
                 if result['resolved']:
                     found_subdomains.append(result)
                     self.logger.info(f"Subdominio encontrado (fuerza bruta): {result['full_domain']}")
-                
-                # Pequeña pausa para no sobrecargar DNS
-                time.sleep(0.1)
         
         return found_subdomains
     
@@ -206,18 +203,23 @@ class SubdomainScanner:
         """Escaneo completo de subdominios combinando múltiples técnicas"""
         self.logger.info(f"Iniciando escaneo completo de subdominios para {domain}")
         
-        start_time = time.time()
+        start_time = time.monotonic()
         all_subdomains = []
         unique_subdomains = set()
         
-        # 1. Subdominios comunes
-        common_results = self.scan_common_subdomains(domain)
-        all_subdomains.extend(common_results)
-        unique_subdomains.update([r['subdomain'] for r in common_results])
+        # La consulta a crt.sh es una única petición lenta (hasta 30s): se lanza en
+        # paralelo mientras se resuelven los subdominios comunes
+        with ThreadPoolExecutor(max_workers=1) as ct_executor:
+            ct_future = ct_executor.submit(self.scan_certificate_transparency, domain)
+            
+            # 1. Subdominios comunes
+            common_results = self.scan_common_subdomains(domain)
+            all_subdomains.extend(common_results)
+            unique_subdomains.update([r['subdomain'] for r in common_results])
         
         # 2. Certificate Transparency
         try:
-            ct_subdomains = self.scan_certificate_transparency(domain)
+            ct_subdomains = ct_future.result()
             
             # Resolver subdominios encontrados en CT
             if ct_subdomains:
@@ -253,29 +255,36 @@ class SubdomainScanner:
                 all_subdomains.extend(bruteforce_results)
         
         # Estadísticas finales
-        scan_duration = time.time() - start_time
+        scan_duration = time.monotonic() - start_time
+        
+        # Agrupar por estado HTTP (una sola pasada sobre los resultados)
+        with_https = with_http = dns_only = 0
+        for sub in all_subdomains:
+            has_https = bool(sub.get('https_status'))
+            has_http = bool(sub.get('http_status'))
+            with_https += has_https
+            with_http += has_http
+            if not has_https and not has_http:
+                dns_only += 1
         
-        # Agrupar por estado HTTP
-        active_subdomains = [s for s in all_subdomains 
-                           if s.get('https_status') or s.get('http_status')]
+        active_count = len(all_subdomains) - dns_only
         
         results = {
             'domain': domain,
             'scan_duration': scan_duration,
             'total_found': len(all_subdomains),
-            'active_subdomains': len(active_subdomains),
+            'active_subdomains': active_count,
             'subdomains': all_subdomains,
             'summary': {
-                'with_https': len([s for s in all_subdomains if s.get('https_status')]),
-                'with_http': len([s for s in all_subdomains if s.get('http_status')]),
-                'dns_only': len([s for s in all_subdomains 
-                               if not s.get('https_status') and not s.get('http_status')])
+                'with_https': with_https,
+                'with_http': with_http,
+                'dns_only': dns_only
             }
         }
         
         self.logger.info(f"Escaneo completo de subdominios finalizado:")
         self.logger.info(f"  - Duración: {scan_duration:.2f}s")
         self.logger.info(f"  - Subdominios encontrados: {len(all_subdomains)}")
-        self.logger.info(f"  - Subdominios activos: {len(active_subdomains)}")
+        self.logger.info(f"  - Subdominios activos: {active_count}")
         
         return results
@@ -13,38 +13,125 @@ from typing import Dict, List, Optional, Any, Tuple, Union
 from contextlib import contextmanager
 import threading
 import logging
+import atexit
+import weakref
 
 from .models import (
     Domain, DiscoveredPath, ScanSession, Alert, WordlistEntry, 
     SystemConfig, DatabaseSchema, ScanStatus, AlertSeverity, AlertStatus
 )
 
+# PRAGMAs que valen solo para la conexión y se aplican al abrir cada una (un único
+# executescript); journal_mode y auto_vacuum persisten en el archivo y se fijan en
+# _initialize_database. El busy timeout lo da database.timeout en sqlite3.connect
+_CONNECTION_PRAGMAS = '''
+    PRAGMA synchronous = NORMAL;
+    PRAGMA cache_size = -64000;
+    PRAGMA foreign_keys = ON;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA mmap_size = 268435456;
+'''
+
+class _Connection(sqlite3.Connection):
+    """Conexión SQLite que admite referencias débiles (para cerrarla al salir)"""
+
+# Conexiones por hilo abiertas por cualquier DatabaseManager; las que siguen
+# vivas al terminar el proceso se cierran en _close_open_connections
+_open_connections = weakref.WeakSet()
+
+@atexit.register
+def _close_open_connections() -> None:
+    """Cerrar las conexiones que sigan abiertas al salir del intérprete"""
+    for conn in list(_open_connections):
+        try:
+            conn.close()
+        except Exception:
+            pass  # Conexión de otro hilo con check_same_thread o ya cerrada
+
 class DatabaseManager:
     """Gestor principal de base de datos"""
     
-    def __init__(self, config: Optional[Dict] = None):
-        """Inicializar gestor de base de datos"""
-        self.config = config or {}
-        self.db_path = self.config.get('database.path', 'webfuzzing.db')
+    def __init__(self, config: Optional[Any] = None):
+        """
+        Inicializar gestor de base de datos
+        
+        Args:
+            config: Instancia de Config, diccionario (anidado o con claves
+                    'database.path') o None para la configuración por defecto
+        """
+        self.config = config if config is not None else {}
         self.logger = logging.getLogger(__name__)
-        self._lock = threading.RLock()
+        self._local = threading.local()  # Conexión reutilizada por hilo
+        
+        # Valores de configuración ya resueltos (la configuración no cambia en ejecución)
+        self._config_values: Dict[Tuple[str, Any], Any] = {}
         
-        # Crear directorio de base de datos si no existe
-        db_dir = os.path.dirname(os.path.abspath(self.db_path))
-        if db_dir and not os.path.exists(db_dir):
-            os.makedirs(db_dir, exist_ok=True)
+        # Obtener configuración de base de datos
+        self.db_path = self._get_config_value('database.path', 'webfuzzing.db')
+        self.timeout = self._get_config_value('database.timeout', 30.0)
+        self.check_same_thread = self._get_config_value('database.check_same_thread', False)
         
-        # Inicializar base de datos
+        # Crear directorio si no existe e inicializar esquema
+        self._ensure_db_directory()
         self._initialize_database()
     
+    def _get_config_value(self, key: str, default: Any = None) -> Any:
+        """Obtener valor de configuración de forma segura (memoizado por clave)"""
+        cache_key = (key, default)
+        try:
+            return self._config_values[cache_key]
+        except (KeyError, TypeError):
+            pass
+        
+        value = self._resolve_config_value(key, default)
+        try:
+            self._config_values[cache_key] = value
+        except TypeError:
+            pass  # default no hasheable: no se memoiza
+        return value
+    
+    def _resolve_config_value(self, key: str, default: Any = None) -> Any:
+        """Resolver un valor de configuración, navegando claves anidadas"""
+        try:
+            if isinstance(self.config, dict):
+                if key in self.config:
+                    return self.config[key]
+                # Navegar por claves anidadas (ej: 'database.path')
+                value = self.config
+                for k in key.split('.'):
+                    if isinstance(value, dict) and k in value:
+                        value = value[k]
+                    else:
+                        return default
+                return value
+            elif hasattr(self.config, 'get') and callable(self.config.get):
+                return self.config.get(key, default)
+            else:
+                return default
+        except Exception as e:
+            self.logger.warning(f"Error obteniendo configuración {key}: {e}")
+            return default
+    
+    def _ensure_db_directory(self) -> None:
+        """Asegurar que el directorio de la base de datos existe"""
+        try:
+            db_dir = os.path.dirname(os.path.abspath(self.db_path))
+            if db_dir and not os.path.exists(db_dir):
+                os.makedirs(db_dir, exist_ok=True)
+                self.logger.info(f"Directorio de BD creado: {db_dir}")
+        except Exception as e:
+            self.logger.error(f"Error creando directorio de BD: {e}")
+    
     def _initialize_database(self) -> None:
         """Inicializar esquema de base de datos"""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Habilitar claves foráneas
-                cursor.execute('PRAGMA foreign_keys = ON')
+                # Ajustes persistentes en el archivo: auto_vacuum solo surte efecto
+                # antes de crear las tablas; WAL para que los lectores no bloqueen
+                # al escritor
+                cursor.executescript('PRAGMA auto_vacuum = INCREMENTAL; PRAGMA journal_mode = WAL;')
                 
                 # Crear todas las tablas e índices
                 DatabaseSchema.create_all_tables(cursor)
@@ -73,34 +160,49 @@ class DatabaseManager:
             ('system.version', '1.0.0', 'system', 'Versión del sistema')
         ]
         
-        for key, value, category, description in default_configs:
-            cursor.execute('''
-                INSERT OR IGNORE INTO system_config (key, value, category, description)
-                VALUES (?, ?, ?, ?)
-            ''', (key, value, category, description))
+        cursor.executemany('''
+            INSERT OR IGNORE INTO system_config (key, value, category, description)
+            VALUES (?, ?, ?, ?)
+        ''', default_configs)
+    
+    def _thread_connection(self) -> sqlite3.Connection:
+        """Obtener la conexión del hilo actual, abriéndola en el primer uso"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=self.timeout,
+                check_same_thread=self.check_same_thread,
+                factory=_Connection
+            )
+            conn.row_factory = sqlite3.Row
+            # Con WAL (fijado al crear la base) basta synchronous=NORMAL
+            conn.executescript(_CONNECTION_PRAGMAS)
+            self._local.conn = conn
+            _open_connections.add(conn)
+        return conn
     
     @contextmanager
     def get_connection(self):
-        """Context manager para conexiones de base de datos"""
-        conn = None
+        """
+        Context manager para la conexión de base de datos del hilo actual
+        
+        Cada hilo usa su propia conexión, por lo que no hace falta un lock
+        global: en modo WAL SQLite serializa a los escritores y los lectores
+        no se bloquean entre sí.
+        """
+        conn = self._thread_connection()
         try:
-            with self._lock:
-                conn = sqlite3.connect(
-                    self.db_path,
-                    timeout=30.0,
-                    check_same_thread=False
-                )
-                conn.row_factory = sqlite3.Row
-                conn.execute('PRAGMA foreign_keys = ON')
-                yield conn
+            yield conn
         except Exception as e:
-            if conn:
-                conn.rollback()
+            conn.rollback()
             self.logger.error(f"Error en conexión de base de datos: {e}")
             raise
         finally:
-            if conn:
-                conn.close()
+            # La conexión se reutiliza: descartar lo que no se haya confirmado,
+            # igual que ocurría al cerrarla
+            if conn.in_transaction:
+                conn.rollback()
     
     def execute_query(self, query: str, params: Tuple = (), fetch: bool = False) -> Union[List[Dict], int]:
         """Ejecutar consulta SQL"""
@@ -127,24 +229,23 @@ class DatabaseManager:
     # ===========================================
     
     def add_domain(self, domain: str, port: int = 443, protocol: str = 'https', **kwargs) -> int:
-        """Agregar nuevo dominio"""
+        """Agregar dominio (o actualizar puerto/protocolo si ya existe) y devolver su ID"""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Verificar si el dominio ya existe
-                cursor.execute('SELECT id FROM domains WHERE domain = ?', (domain,))
-                existing = cursor.fetchone()
-                
-                if existing:
-                    raise ValueError(f"El dominio {domain} ya existe")
-                
-                # Insertar nuevo dominio
+                # Un solo round trip: UPSERT sobre domain UNIQUE con RETURNING
+                # (sin INSERT OR REPLACE, que borraría la fila y sus dependientes)
                 cursor.execute('''
                     INSERT INTO domains (
                         domain, protocol, port, scan_frequency, 
                         custom_headers, auth_required, auth_token
                     ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(domain) DO UPDATE SET
+                        port = excluded.port,
+                        protocol = excluded.protocol,
+                        updated_at = CURRENT_TIMESTAMP
+                    RETURNING id
                 ''', (
                     domain, protocol, port,
                     kwargs.get('scan_frequency', 24),
@@ -153,7 +254,7 @@ class DatabaseManager:
                     kwargs.get('auth_token')
                 ))
                 
-                domain_id = cursor.lastrowid
+                domain_id = cursor.fetchone()[0]
                 conn.commit()
                 
                 self.logger.info(f"Dominio agregado: {domain} (ID: {domain_id})")
@@ -280,17 +381,75 @@ class DatabaseManager:
         except Exception as e:
             self.logger.error(f"Error agregando ruta descubierta: {e}")
             raise
-    
+
+    def add_discovered_paths(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Agregar rutas descubiertas en lote
+
+        Equivalente a llamar add_discovered_path por cada fila (inserta o actualiza
+        según UNIQUE(domain_id, path)), pero en una sola conexión y transacción.
+
+        Args:
+            rows: Diccionarios con domain_id, path, full_url, status_code y los
+                  mismos campos opcionales que add_discovered_path
+
+        Returns:
+            Número de filas procesadas
+        """
+        if not rows:
+            return 0
+
+        params = [
+            (
+                row['domain_id'], row['path'], row['full_url'], row['status_code'],
+                row.get('content_length', 0),
+                row.get('content_type', ''),
+                row.get('response_time', 0.0),
+                row.get('is_critical', False),
+                row.get('method', 'GET'),
+                row.get('response_hash'),
+                row.get('headers')
+            )
+            for row in rows
+        ]
+
+        try:
+            with self.get_connection() as conn:
+                conn.executemany('''
+                    INSERT INTO discovered_paths (
+                        domain_id, path, full_url, status_code, content_length,
+                        content_type, response_time, is_critical, method,
+                        response_hash, headers
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(domain_id, path) DO UPDATE SET
+                        status_code = excluded.status_code,
+                        content_length = excluded.content_length,
+                        content_type = excluded.content_type,
+                        response_time = excluded.response_time,
+                        last_checked = CURRENT_TIMESTAMP,
+                        method = excluded.method,
+                        response_hash = excluded.response_hash,
+                        headers = excluded.headers
+                ''', params)
+                conn.commit()
+
+            self.logger.info(f"Rutas descubiertas guardadas en lote: {len(params)}")
+            return len(params)
+
+        except Exception as e:
+            self.logger.error(f"Error agregando rutas descubiertas en lote: {e}")
+            raise
+
     def get_recent_findings(self, hours: int = 24) -> List[Dict]:
         """Obtener hallazgos recientes"""
         return self.execute_query('''
             SELECT dp.*, d.domain
             FROM discovered_paths dp
             JOIN domains d ON dp.domain_id = d.id
-            WHERE dp.discovered_at >= datetime('now', '-{} hours')
+            WHERE dp.discovered_at >= datetime('now', ?)
             ORDER BY dp.discovered_at DESC
             LIMIT 1000
-        '''.format(hours), fetch=True)
+        ''', (f'-{int(hours)} hours',), fetch=True)
     
     def get_critical_findings(self) -> List[Dict]:
         """Obtener hallazgos críticos"""
@@ -459,27 +618,26 @@ class DatabaseManager:
     
     def add_wordlist_entries(self, wordlist_name: str, words: List[str], 
                            category: str = 'general') -> int:
-        """Agregar entradas a wordlist"""
+        """Agregar entradas a wordlist (un único INSERT preparado para todas las palabras)"""
+        rows = []
+        for word in words:
+            try:
+                rows.append((wordlist_name, word.strip(), category))
+            except Exception as e:
+                self.logger.warning(f"Error agregando palabra '{word}': {e}")
+        
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
-                added_count = 0
+                changes_before = conn.total_changes
                 
-                for word in words:
-                    try:
-                        cursor.execute('''
-                            INSERT OR IGNORE INTO wordlist_entries 
-                            (wordlist_name, word, category) 
-                            VALUES (?, ?, ?)
-                        ''', (wordlist_name, word.strip(), category))
-                        
-                        if cursor.rowcount > 0:
-                            added_count += 1
-                            
-                    except Exception as e:
-                        self.logger.warning(f"Error agregando palabra '{word}': {e}")
-                        continue
+                # OR IGNORE: los duplicados no abortan el lote
+                conn.executemany('''
+                    INSERT OR IGNORE INTO wordlist_entries 
+                    (wordlist_name, word, category) 
+                    VALUES (?, ?, ?)
+                ''', rows)
                 
+                added_count = conn.total_changes - changes_before
                 conn.commit()
                 self.logger.info(f"Agregadas {added_count} palabras a {wordlist_name}")
                 return added_count
@@ -578,41 +736,19 @@ class DatabaseManager:
     
     def get_stats(self) -> Dict[str, Any]:
         """Obtener estadísticas generales"""
-        stats = {}
-        
-        # Contar dominios activos
-        result = self.execute_query('''
-            SELECT COUNT(*) as count FROM domains WHERE is_active = 1
-        ''', fetch=True)
-        stats['total_domains'] = result[0]['count']
-        
-        # Contar hallazgos recientes (24h)
+        # Todos los contadores en una sola consulta; cada subconsulta usa su índice
         result = self.execute_query('''
-            SELECT COUNT(*) as count FROM discovered_paths 
-            WHERE discovered_at >= datetime('now', '-24 hours')
+            SELECT
+                (SELECT COUNT(*) FROM domains WHERE is_active = 1) AS total_domains,
+                (SELECT COUNT(*) FROM discovered_paths
+                 WHERE discovered_at >= datetime('now', '-24 hours')) AS recent_findings,
+                (SELECT COUNT(*) FROM discovered_paths WHERE is_critical = 1) AS critical_findings,
+                (SELECT COUNT(*) FROM alerts WHERE status = 'new') AS new_alerts,
+                (SELECT COUNT(*) FROM scan_sessions
+                 WHERE status IN ('pending', 'running')) AS active_scans
         ''', fetch=True)
-        stats['recent_findings'] = result[0]['count']
         
-        # Contar hallazgos críticos
-        result = self.execute_query('''
-            SELECT COUNT(*) as count FROM discovered_paths WHERE is_critical = 1
-        ''', fetch=True)
-        stats['critical_findings'] = result[0]['count']
-        
-        # Contar alertas nuevas
-        result = self.execute_query('''
-            SELECT COUNT(*) as count FROM alerts WHERE status = 'new'
-        ''', fetch=True)
-        stats['new_alerts'] = result[0]['count']
-        
-        # Contar sesiones activas
-        result = self.execute_query('''
-            SELECT COUNT(*) as count FROM scan_sessions 
-            WHERE status IN ('pending', 'running')
-        ''', fetch=True)
-        stats['active_scans'] = result[0]['count']
-        
-        return stats
+        return result[0]
     
     # ===========================================
     # MÉTODOS DE MANTENIMIENTO
@@ -629,28 +765,31 @@ class DatabaseManager:
                 # Limpiar sesiones de escaneo antiguas
                 cursor.execute('''
                     DELETE FROM scan_sessions 
-                    WHERE finished_at < datetime('now', '-{} days')
+                    WHERE finished_at < datetime('now', ?)
                     AND status = 'completed'
-                '''.format(days))
+                ''', (f'-{int(days)} days',))
                 results['scan_sessions'] = cursor.rowcount
                 
                 # Limpiar alertas resueltas antiguas
                 cursor.execute('''
                     DELETE FROM alerts 
-                    WHERE resolved_at < datetime('now', '-{} days')
+                    WHERE resolved_at < datetime('now', ?)
                     AND status = 'resolved'
-                '''.format(days))
+                ''', (f'-{int(days)} days',))
                 results['alerts'] = cursor.rowcount
                 
                 # Limpiar rutas no críticas antiguas
                 cursor.execute('''
                     DELETE FROM discovered_paths 
-                    WHERE last_checked < datetime('now', '-{} days')
+                    WHERE last_checked < datetime('now', ?)
                     AND is_critical = 0
-                '''.format(days * 2))  # Mantener rutas no críticas por más tiempo
+                ''', (f'-{int(days) * 2} days',))  # Mantener rutas no críticas por más tiempo
                 results['paths'] = cursor.rowcount
                 
                 conn.commit()
+            
+            if any(results.values()):
+                self.incremental_vacuum()
                 
         except Exception as e:
             self.logger.error(f"Error en limpieza de datos: {e}")
@@ -658,11 +797,27 @@ class DatabaseManager:
         
         return results
     
+    def incremental_vacuum(self) -> None:
+        """
+        Devolver al sistema de archivos las páginas liberadas por borrados
+        
+        Solo tiene efecto en bases creadas con auto_vacuum = INCREMENTAL; en
+        las demás el PRAGMA no hace nada.
+        """
+        with self.get_connection() as conn:
+            # executescript ejecuta el PRAGMA hasta el final (libera todas las páginas)
+            conn.executescript('PRAGMA incremental_vacuum;')
+    
     def backup_database(self, backup_path: str) -> bool:
         """Crear backup de la base de datos"""
         try:
-            import shutil
-            shutil.copy2(self.db_path, backup_path)
+            # API de backup de SQLite: incluye lo que aún está en el archivo WAL
+            with self.get_connection() as conn:
+                backup_conn = sqlite3.connect(backup_path)
+                try:
+                    conn.backup(backup_conn)
+                finally:
+                    backup_conn.close()
             self.logger.info(f"Backup creado: {backup_path}")
             return True
         except Exception as e:
@@ -703,6 +858,29 @@ class DatabaseManager:
         
         return info
     
+    def get_database_path(self) -> str:
+        """Obtener ruta de la base de datos"""
+        return self.db_path
+    
+    def database_exists(self) -> bool:
+        """Verificar si la base de datos existe"""
+        return os.path.exists(self.db_path)
+    
+    def get_database_size(self) -> int:
+        """Obtener tamaño de la base de datos en bytes"""
+        try:
+            if self.database_exists():
+                return os.path.getsize(self.db_path)
+            return 0
+        except Exception as e:
+            self.logger.error(f"Error obteniendo tamaño de BD: {e}")
+            return 0
+    
     def close(self) -> None:
         """Cerrar conexiones (para cleanup)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            _open_connections.discard(conn)
+            self._local.conn = None
         self.logger.info("DatabaseManager cerrado")
\ No newline at end of file
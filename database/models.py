@@ -359,7 +359,9 @@ class DatabaseSchema:
         'CREATE INDEX IF NOT EXISTS idx_domains_last_scan ON domains(last_scan)',
         'CREATE INDEX IF NOT EXISTS idx_paths_domain_id ON discovered_paths(domain_id)',
         'CREATE INDEX IF NOT EXISTS idx_paths_critical ON discovered_paths(is_critical)',
-        'CREATE INDEX IF NOT EXISTS idx_paths_discovered_at ON discovered_paths(discovered_at)',
+        # Reemplazado por idx_paths_discovered_domain en bases de datos existentes
+        'DROP INDEX IF EXISTS idx_paths_discovered_at',
+        'CREATE INDEX IF NOT EXISTS idx_paths_discovered_domain ON discovered_paths(discovered_at DESC, domain_id)',
         'CREATE INDEX IF NOT EXISTS idx_paths_status_code ON discovered_paths(status_code)',
         'CREATE INDEX IF NOT EXISTS idx_sessions_domain_id ON scan_sessions(domain_id)',
         'CREATE INDEX IF NOT EXISTS idx_sessions_status ON scan_sessions(status)',
@@ -373,16 +375,13 @@ class DatabaseSchema:
         'CREATE INDEX IF NOT EXISTS idx_config_category ON system_config(category)'
     ]
     
+    # Script DDL completo (tablas + índices), armado una sola vez al cargar el módulo
+    SCHEMA_SCRIPT = 'BEGIN;\n' + ';\n'.join(list(TABLES.values()) + INDEXES) + ';\nCOMMIT;'
+    
     @classmethod
     def create_all_tables(cls, cursor: sqlite3.Cursor) -> None:
-        """Crear todas las tablas e índices"""
-        # Crear tablas
-        for table_name, sql in cls.TABLES.items():
-            cursor.execute(sql)
-        
-        # Crear índices
-        for index_sql in cls.INDEXES:
-            cursor.execute(index_sql)
+        """Crear todas las tablas e índices en un único lote y transacción"""
+        cursor.executescript(cls.SCHEMA_SCRIPT)
     
     @classmethod
     def get_table_info(cls, table_name: str) -> Optional[str]:
@@ -19,6 +19,18 @@ logger = logging.getLogger(__name__)
 class IntegrationManager:
     """Gestor central de todas las integraciones"""
     
+    # Nombre legible de cada herramienta de fuzzing
+    _TOOL_NAMES = {'ffuf': 'FFUF', 'dirsearch': 'Dirsearch'}
+    
+    # Método a invocar según (herramienta, tipo de escaneo)
+    _SCAN_METHODS = {
+        ('ffuf', 'directory'): 'fuzz_directories',
+        ('ffuf', 'file'): 'fuzz_files',
+        ('ffuf', 'subdomain'): 'fuzz_subdomains',
+        ('dirsearch', 'directory'): 'scan_directory',
+        ('dirsearch', 'file'): 'scan_directory',
+    }
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Inicializar gestor de integraciones
@@ -215,34 +227,24 @@ class IntegrationManager:
         
         # Ejecutar escaneo según la herramienta
         try:
-            if tool == 'ffuf':
-                ffuf = self.integrations.get('ffuf')
-                if not ffuf or not ffuf.is_available:
-                    return {'success': False, 'error': 'FFUF no disponible'}
-                
-                if scan_type == 'directory':
-                    return ffuf.fuzz_directories(url, **kwargs)
-                elif scan_type == 'file':
-                    return ffuf.fuzz_files(url, **kwargs)
-                elif scan_type == 'subdomain':
-                    # Extraer dominio de la URL
-                    domain = url.replace('http://', '').replace('https://', '').split('/')[0]
-                    return ffuf.fuzz_subdomains(domain, **kwargs)
-                else:
-                    return {'success': False, 'error': f'Tipo de escaneo {scan_type} no soportado por FFUF'}
+            tool_name = self._TOOL_NAMES.get(tool)
+            if tool_name is None:
+                return {'success': False, 'error': f'Herramienta {tool} no reconocida'}
             
-            elif tool == 'dirsearch':
-                dirsearch = self.integrations.get('dirsearch')
-                if not dirsearch or not dirsearch.is_available:
-                    return {'success': False, 'error': 'Dirsearch no disponible'}
-                
-                if scan_type in ['directory', 'file']:
-                    return dirsearch.scan_directory(url, **kwargs)
-                else:
-                    return {'success': False, 'error': f'Tipo de escaneo {scan_type} no soportado por Dirsearch'}
+            integration = self.integrations.get(tool)
+            if not integration or not integration.is_available:
+                return {'success': False, 'error': f'{tool_name} no disponible'}
             
-            else:
-                return {'success': False, 'error': f'Herramienta {tool} no reconocida'}
+            method_name = self._SCAN_METHODS.get((tool, scan_type))
+            if method_name is None:
+                return {'success': False, 'error': f'Tipo de escaneo {scan_type} no soportado por {tool_name}'}
+            
+            target = url
+            if scan_type == 'subdomain':
+                # Extraer dominio de la URL
+                target = url.replace('http://', '').replace('https://', '').split('/')[0]
+            
+            return getattr(integration, method_name)(target, **kwargs)
                 
         except Exception as e:
             self.logger.error(f"Error ejecutando escaneo con {tool}: {e}")
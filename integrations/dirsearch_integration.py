@@ -12,6 +12,24 @@ from typing import Dict, List, Optional, Any
 from pathlib import Path
 import threading
 import time
+import re
+
+# Patrones de hallazgos críticos, compilados una vez para todo el módulo
+_CRITICAL_PATHS_RE = re.compile('|'.join(map(re.escape, [
+    'admin', 'administrator', 'wp-admin', 'phpmyadmin',
+    'config', 'backup', 'database', 'db', 'sql',
+    'test', 'staging', 'dev', 'debug',
+    '.env', '.git', '.htaccess', 'web.config',
+    'api', 'v1', 'v2', 'swagger',
+    'login', 'signin', 'auth'
+])))
+
+_CRITICAL_EXTENSIONS = (
+    '.sql', '.bak', '.backup', '.old', '.config',
+    '.env', '.key', '.pem', '.p12', '.pfx'
+)
+
+_SENSITIVE_TERMS_RE = re.compile('password|secret|key|token|private')
 
 class DirsearchIntegration:
     """Integración con la herramienta Dirsearch"""
@@ -118,7 +136,7 @@ class DirsearchIntegration:
             self.logger.info(f"Ejecutando Dirsearch en: {url}")
             self.logger.debug(f"Comando: {' '.join(cmd)}")
             
-            start_time = time.time()
+            start_time = time.monotonic()
             result = subprocess.run(
                 cmd,
                 capture_output=True,
@@ -126,7 +144,7 @@ class DirsearchIntegration:
                 timeout=kwargs.get('max_time', 3600)  # 1 hora máximo
             )
             
-            execution_time = time.time() - start_time
+            execution_time = time.monotonic() - start_time
             
             # Procesar resultados
             findings = self._parse_dirsearch_output(output_file)
@@ -218,39 +236,13 @@ class DirsearchIntegration:
         path = data.get('path', '').lower()
         status_code = data.get('status', 0)
         
-        # Rutas críticas comunes
-        critical_paths = [
-            'admin', 'administrator', 'wp-admin', 'phpmyadmin',
-            'config', 'backup', 'database', 'db', 'sql',
-            'test', 'staging', 'dev', 'debug',
-            '.env', '.git', '.htaccess', 'web.config',
-            'api', 'v1', 'v2', 'swagger',
-            'login', 'signin', 'auth'
-        ]
-        
-        # Extensiones críticas
-        critical_extensions = [
-            '.sql', '.bak', '.backup', '.old', '.config',
-            '.env', '.key', '.pem', '.p12', '.pfx'
-        ]
-        
-        # Verificar rutas críticas
-        for critical_path in critical_paths:
-            if critical_path in path:
-                return True
-        
-        # Verificar extensiones críticas
-        for ext in critical_extensions:
-            if path.endswith(ext):
-                return True
+        # Rutas y extensiones críticas
+        if _CRITICAL_PATHS_RE.search(path) or path.endswith(_CRITICAL_EXTENSIONS):
+            return True
         
-        # Códigos de estado críticos
-        if status_code in [200, 301, 302, 500]:
-            # Verificar contenido sensible en la ruta
-            sensitive_terms = ['password', 'secret', 'key', 'token', 'private']
-            for term in sensitive_terms:
-                if term in path:
-                    return True
+        # Códigos de estado críticos: verificar contenido sensible en la ruta
+        if status_code in (200, 301, 302, 500) and _SENSITIVE_TERMS_RE.search(path):
+            return True
         
         return False
     
@@ -10,6 +10,72 @@ import tempfile
 import logging
 from typing import Dict, List, Optional, Any
 import time
+import re
+from html import escape
+
+# Patrones de hallazgos críticos, compilados una vez para todo el módulo
+_CRITICAL_PATHS_RE = re.compile('|'.join(map(re.escape, [
+    'admin', 'administrator', 'wp-admin', 'phpmyadmin',
+    'config', 'backup', 'database', 'db', 'sql',
+    'test', 'staging', 'dev', 'debug',
+    '.env', '.git', '.htaccess', 'web.config',
+    'api', 'v1', 'v2', 'swagger', 'docs',
+    'login', 'signin', 'auth', 'panel'
+])))
+
+_CRITICAL_EXTENSIONS = (
+    '.sql', '.bak', '.backup', '.old', '.config',
+    '.env', '.key', '.pem', '.p12', '.pfx', '.log'
+)
+
+_SENSITIVE_TERMS_RE = re.compile('password|secret|key|token|private|internal')
+
+_CRITICAL_SUBDOMAINS = frozenset(['admin', 'test', 'dev', 'staging', 'api', 'internal', 'vpn'])
+
+# Plantillas del reporte HTML (las llaves del CSS van duplicadas para format_map)
+_HTML_REPORT_HEADER = """
+            <!DOCTYPE html>
+            <html>
+            <head>
+                <title>FFUF Fuzzing Report</title>
+                <style>
+                    body {{ font-family: Arial, sans-serif; margin: 20px; }}
+                    .critical {{ background-color: #ffebee; }}
+                    .normal {{ background-color: #f5f5f5; }}
+                    table {{ border-collapse: collapse; width: 100%; }}
+                    th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
+                    th {{ background-color: #f2f2f2; }}
+                </style>
+            </head>
+            <body>
+                <h1>FFUF Fuzzing Report</h1>
+                <p><strong>URL:</strong> {url}</p>
+                <p><strong>Total Found:</strong> {total}</p>
+                <p><strong>Execution Time:</strong> {time:.2f}s</p>
+                
+                <table>
+                    <tr>
+                        <th>Path</th>
+                        <th>Status</th>
+                        <th>Length</th>
+                        <th>Critical</th>
+                    </tr>
+            """
+
+_HTML_REPORT_ROW = """
+                    <tr class="{css_class}">
+                        <td>{path}</td>
+                        <td>{status_code}</td>
+                        <td>{content_length}</td>
+                        <td>{critical}</td>
+                    </tr>
+                """
+
+_HTML_REPORT_FOOTER = """
+                </table>
+            </body>
+            </html>
+            """
 
 class FFUFIntegration:
     """Integración con la herramienta FFUF"""
@@ -276,7 +342,7 @@ class FFUFIntegration:
             self.logger.info(f"Ejecutando FFUF en: {url}")
             self.logger.debug(f"Comando: {' '.join(cmd)}")
             
-            start_time = time.time()
+            start_time = time.monotonic()
             result = subprocess.run(
                 cmd,
                 capture_output=True,
@@ -284,7 +350,7 @@ class FFUFIntegration:
                 timeout=kwargs.get('command_timeout', 3600)  # 1 hora máximo
             )
             
-            execution_time = time.time() - start_time
+            execution_time = time.monotonic() - start_time
             
             # Procesar resultados
             findings = self._parse_ffuf_output(output_file)
@@ -376,46 +442,16 @@ class FFUFIntegration:
         status_code = result.get('status', 0)
         content_length = result.get('length', 0)
         
-        # Rutas críticas comunes
-        critical_paths = [
-            'admin', 'administrator', 'wp-admin', 'phpmyadmin',
-            'config', 'backup', 'database', 'db', 'sql',
-            'test', 'staging', 'dev', 'debug',
-            '.env', '.git', '.htaccess', 'web.config',
-            'api', 'v1', 'v2', 'swagger', 'docs',
-            'login', 'signin', 'auth', 'panel'
-        ]
-        
-        # Extensiones críticas
-        critical_extensions = [
-            '.sql', '.bak', '.backup', '.old', '.config',
-            '.env', '.key', '.pem', '.p12', '.pfx', '.log'
-        ]
-        
-        # Verificar rutas críticas
-        for critical_path in critical_paths:
-            if critical_path in path:
-                return True
-        
-        # Verificar extensiones críticas
-        for ext in critical_extensions:
-            if path.endswith(ext):
-                return True
+        # Rutas y extensiones críticas
+        if _CRITICAL_PATHS_RE.search(path) or path.endswith(_CRITICAL_EXTENSIONS):
+            return True
         
         # Códigos de estado críticos con contenido
-        if status_code in [200, 500] and content_length > 0:
-            sensitive_terms = ['password', 'secret', 'key', 'token', 'private', 'internal']
-            for term in sensitive_terms:
-                if term in path:
-                    return True
+        if status_code in (200, 500) and content_length > 0 and _SENSITIVE_TERMS_RE.search(path):
+            return True
         
         # Subdominios críticos
-        subdomain_critical = ['admin', 'test', 'dev', 'staging', 'api', 'internal', 'vpn']
-        for sub in subdomain_critical:
-            if path == sub:
-                return True
-        
-        return False
+        return path in _CRITICAL_SUBDOMAINS
     
     def auto_calibrate(self, url: str, wordlist: str = None) -> Dict[str, Any]:
         """Auto-calibrar filtros para reducir falsos positivos"""
@@ -479,58 +515,24 @@ class FFUFIntegration:
             return json.dumps(results, indent=2)
         
         elif output_format == 'html':
-            # Generar reporte HTML básico
-            html = """
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>FFUF Fuzzing Report</title>
-                <style>
-                    body { font-family: Arial, sans-serif; margin: 20px; }
-                    .critical { background-color: #ffebee; }
-                    .normal { background-color: #f5f5f5; }
-                    table { border-collapse: collapse; width: 100%; }
-                    th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
-                    th { background-color: #f2f2f2; }
-                </style>
-            </head>
-            <body>
-                <h1>FFUF Fuzzing Report</h1>
-                <p><strong>URL:</strong> {url}</p>
-                <p><strong>Total Found:</strong> {total}</p>
-                <p><strong>Execution Time:</strong> {time:.2f}s</p>
-                
-                <table>
-                    <tr>
-                        <th>Path</th>
-                        <th>Status</th>
-                        <th>Length</th>
-                        <th>Critical</th>
-                    </tr>
-            """.format(
-                url=results.get('url', ''),
-                total=results.get('total_found', 0),
-                time=results.get('execution_time', 0)
+            # Generar reporte HTML básico a partir de las plantillas precompuestas
+            header = _HTML_REPORT_HEADER.format_map({
+                'url': escape(str(results.get('url', ''))),
+                'total': results.get('total_found', 0),
+                'time': results.get('execution_time', 0)
+            })
+            rows = ''.join(
+                _HTML_REPORT_ROW.format_map({
+                    'css_class': 'critical' if finding.get('is_critical') else 'normal',
+                    'path': escape(str(finding.get('path', ''))),
+                    'status_code': finding.get('status_code', ''),
+                    'content_length': finding.get('content_length', ''),
+                    'critical': 'Yes' if finding.get('is_critical') else 'No'
+                })
+                for finding in results.get('findings', [])
             )
             
-            for finding in results.get('findings', []):
-                css_class = 'critical' if finding.get('is_critical') else 'normal'
-                html += f"""
-                    <tr class="{css_class}">
-                        <td>{finding.get('path', '')}</td>
-                        <td>{finding.get('status_code', '')}</td>
-                        <td>{finding.get('content_length', '')}</td>
-                        <td>{'Yes' if finding.get('is_critical') else 'No'}</td>
-                    </tr>
-                """
-            
-            html += """
-                </table>
-            </body>
-            </html>
-            """
-            
-            return html
+            return header + rows + _HTML_REPORT_FOOTER
         
         else:
             return str(results)
\ No newline at end of file
@@ -16,6 +16,15 @@ import queue
 class TelegramBot:
     """Bot de Telegram para notificaciones"""
     
+    # Emojis por severidad
+    SEVERITY_EMOJIS = {
+        'info': '🔍',
+        'warning': '⚠️',
+        'critical': '🚨',
+        'success': '✅',
+        'error': '❌'
+    }
+    
     def __init__(self, config: Dict[str, Any]):
         """Inicializar bot de Telegram"""
         self.config = config
@@ -27,8 +36,8 @@ class TelegramBot:
         self.enabled = self.config.get('telegram.enabled', False)
         self.api_url = f"https://api.telegram.org/bot{self.bot_token}"
         
-        # Queue para mensajes
-        self.message_queue = queue.Queue()
+        # Queue para mensajes (acotada: si Telegram no responde no se acumulan sin límite)
+        self.message_queue = queue.Queue(maxsize=self.config.get('telegram.max_queue_size', 1000))
         self.is_running = False
         self.worker_thread = None
         
@@ -139,7 +148,9 @@ class TelegramBot:
                 'disable_web_page_preview': True
             }
             
-            self.message_queue.put(message_data, timeout=5)
+            # Sin espera: con la cola llena (p. ej. Telegram caído) se descarta en el
+            # acto en lugar de bloquear al hilo de escaneo que notifica
+            self.message_queue.put_nowait(message_data)
             return True
             
         except queue.Full:
@@ -152,17 +163,7 @@ class TelegramBot:
     def _format_notification(self, title: str, message: str, severity: str, 
                            url: Optional[str] = None, **kwargs) -> str:
         """Formatear notificación para Telegram"""
-        
-        # Emojis por severidad
-        severity_emojis = {
-            'info': '🔍',
-            'warning': '⚠️',
-            'critical': '🚨',
-            'success': '✅',
-            'error': '❌'
-        }
-        
-        emoji = severity_emojis.get(severity, '📢')
+        emoji = self.SEVERITY_EMOJIS.get(severity, '📢')
         
         # Construir mensaje
         formatted = f"{emoji} <b>{title}</b>\n\n"
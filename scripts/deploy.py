@@ -52,7 +52,7 @@ class Deployer:
         
         # Verificar dependencias
         try:
-            import flask, requests, schedule
+            import flask, requests, croniter
             print("✅ Dependencias Python verificadas")
         except ImportError as e:
             raise Exception(f"Dependencia faltante: {e}")
@@ -6,6 +6,9 @@ import platform
 from pathlib import Path
 import shutil
 
+# Directorio raíz del proyecto (resuelto una sola vez al importar el módulo)
+BASE_DIR = Path(__file__).resolve().parent.parent
+
 def check_python_version():
     """Verificar versión de Python"""
     if sys.version_info < (3, 8):
@@ -19,7 +22,7 @@ def install_requirements():
     """Instalar dependencias de Python"""
     print("\n📦 Instalando dependencias de Python...")
     
-    requirements_file = Path(__file__).parent.parent / "requirements.txt"
+    requirements_file = BASE_DIR / "requirements.txt"
     
     try:
         subprocess.check_call([
@@ -67,7 +70,7 @@ def create_directories():
     """Crear directorios necesarios"""
     print("\n📁 Creando estructura de directorios...")
     
-    base_dir = Path(__file__).parent.parent
+    base_dir = BASE_DIR
     directories = [
         "data",
         "data/diccionarios",
@@ -87,7 +90,7 @@ def create_sample_files():
     """Crear archivos de ejemplo"""
     print("\n📄 Creando archivos de ejemplo...")
     
-    base_dir = Path(__file__).parent.parent
+    base_dir = BASE_DIR
     
     # Archivo de dominios de ejemplo
     domains_file = base_dir / "data" / "dominios.csv"
@@ -129,7 +132,7 @@ def create_config_file():
     """Crear archivo de configuración"""
     print("\n⚙️ Creando archivo de configuración...")
     
-    base_dir = Path(__file__).parent.parent
+    base_dir = BASE_DIR
     config_file = base_dir / "config.json"
     
     if config_file.exists():
@@ -1,12 +1,16 @@
 # scripts/scheduler.py
-import schedule
+import heapq
 import time
 import threading
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
 import subprocess
 import sys
 from pathlib import Path
 
+from croniter import croniter
+
 # Agregar el directorio raíz al path
 sys.path.append(str(Path(__file__).parent.parent))
 
@@ -16,6 +20,19 @@ from utils.logger import get_logger
 from utils.notifications import NotificationManager
 from config.database import DatabaseManager
 
+@dataclass
+class ScheduledTask:
+    """Tarea programada mediante una expresión cron"""
+    # __slots__ explícito (dataclass(slots=True) requiere Python 3.10+);
+    # incompatible con valores por defecto, por eso todos los campos son obligatorios
+    __slots__ = ('name', 'pattern', 'handler', 'next_run', 'last_run')
+    
+    name: str
+    pattern: str
+    handler: Callable[[Optional[datetime]], None]
+    next_run: Optional[datetime]
+    last_run: Optional[datetime]
+
 class TaskScheduler:
     """Programador de tareas para automatización del sistema"""
     
@@ -29,6 +46,13 @@ class TaskScheduler:
         # Estado del programador
         self.is_running = False
         self.scheduler_thread = None
+        self.tasks: Dict[str, ScheduledTask] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._wakeup = threading.Event()
+        self._next_tasks_cache: Tuple[float, Optional[List[Dict]]] = (0.0, None)
+        
+        # Horario laboral precalculado (evita re-parsear la config en cada ejecución)
+        self._working_hours = self._parse_working_hours()
         
         # Configurar horarios
         self._setup_schedules()
@@ -36,36 +60,72 @@ class TaskScheduler:
     def _setup_schedules(self):
         """Configurar horarios de ejecución"""
         # Escaneos generales en horarios específicos
-        schedule.every().day.at("08:00").do(self._run_general_scan)
-        schedule.every().day.at("13:00").do(self._run_general_scan)
-        schedule.every().day.at("18:00").do(self._run_general_scan)
-        schedule.every().day.at("23:00").do(self._run_general_scan)
+        self.register_cron_task(
+            'general_scan',
+            self.config.get('schedules.general_scan', '0 8,13,18,23 * * *'),
+            self._run_general_scan
+        )
         
         # Escaneo profundo semanal
-        schedule.every().sunday.at("02:00").do(self._run_deep_scan)
+        self.register_cron_task(
+            'deep_scan',
+            self.config.get('schedules.deep_scan', '0 2 * * 0'),
+            self._run_deep_scan
+        )
         
         # Reportes sin novedades
-        schedule.every().day.at("09:00").do(self._send_status_report)
-        schedule.every().day.at("14:00").do(self._send_status_report)
+        for report_time in self.config.get('schedules.report_times', ['09:00', '14:00']):
+            hour, minute = report_time.split(':')
+            self.register_cron_task(
+                f"status_report_{hour}{minute}",
+                f"{int(minute)} {int(hour)} * * *",
+                self._send_status_report
+            )
         
         # Tareas de mantenimiento
-        schedule.every().day.at("03:00").do(self._cleanup_old_data)
-        schedule.every().hour.do(self._check_critical_alerts)
+        self.register_cron_task('cleanup_old_data', '0 3 * * *', self._cleanup_old_data)
+        self.register_cron_task('check_critical_alerts', '0 * * * *', self._check_critical_alerts)
         
         # Backup de base de datos
-        schedule.every().day.at("04:00").do(self._backup_database)
+        self.register_cron_task('backup_database', '0 4 * * *', self._backup_database)
         
         self.logger.info("Horarios configurados correctamente")
     
-    def _run_general_scan(self):
+    def _parse_working_hours(self) -> Tuple[int, int]:
+        """Obtener (hora_inicio, hora_fin) del horario laboral configurado"""
+        start = self.config.get('schedules.working_hours.start', '08:00')
+        end = self.config.get('schedules.working_hours.end', '16:00')
+        return int(start.split(':')[0]), int(end.split(':')[0])
+    
+    def register_cron_task(self, name: str, pattern: str, handler: Callable[[Optional[datetime]], None]) -> bool:
+        """Registrar una tarea con su expresión cron"""
+        if not croniter.is_valid(pattern):
+            self.logger.error(f"Expresión cron inválida para {name}: {pattern}")
+            return False
+        
+        task = ScheduledTask(name=name, pattern=pattern, handler=handler,
+                             next_run=None, last_run=None)
+        task.next_run = self._calculate_next_run(task, datetime.now())
+        self.tasks[name] = task
+        heapq.heappush(self._heap, (task.next_run.timestamp(), name))
+        self._next_tasks_cache = (0.0, None)
+        self._wakeup.set()
+        
+        self.logger.debug(f"Tarea {name} programada ({pattern}), próxima ejecución: {task.next_run}")
+        return True
+    
+    def _calculate_next_run(self, task: ScheduledTask, start_time: datetime) -> datetime:
+        """Calcular la próxima ejecución de una tarea a partir de start_time"""
+        return croniter(task.pattern, start_time).get_next(datetime)
+    
+    def _run_general_scan(self, now: Optional[datetime] = None):
         """Ejecutar escaneo general"""
         try:
             self.logger.info("Iniciando escaneo general programado")
             
             # Verificar si es horario de trabajo
-            current_hour = datetime.now().hour
-            working_start = int(self.config.get('schedules.working_hours.start').split(':')[0])
-            working_end = int(self.config.get('schedules.working_hours.end').split(':')[0])
+            current_hour = (now or datetime.now()).hour
+            working_start, working_end = self._working_hours
             
             is_working_hours = working_start <= current_hour <= working_end
             
@@ -90,7 +150,7 @@ class TaskScheduler:
                 f"Error ejecutando escaneo general: {e}"
             )
     
-    def _run_deep_scan(self):
+    def _run_deep_scan(self, now: Optional[datetime] = None):
         """Ejecutar escaneo profundo semanal"""
         try:
             self.logger.info("Iniciando escaneo profundo semanal")
@@ -113,9 +173,11 @@ class TaskScheduler:
         except Exception as e:
             self.logger.error(f"Error en escaneo profundo: {e}")
     
-    def _send_status_report(self):
+    def _send_status_report(self, now: Optional[datetime] = None):
         """Enviar reporte de estado sin novedades"""
         try:
+            now = now or datetime.now()
+            
             # Obtener estadísticas recientes
             recent_findings = self.db.get_recent_findings(6)  # Últimas 6 horas
             critical_findings = self.db.get_critical_findings()
@@ -127,7 +189,7 @@ class TaskScheduler:
                     'paths_found': len(recent_findings),
                     'critical_found': len(critical_findings),
                     'scan_duration': 0,
-                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    'timestamp': now.strftime('%Y-%m-%d %H:%M:%S')
                 }
                 
                 self.notifications.send_scan_report(stats, recent_findings)
@@ -138,9 +200,11 @@ class TaskScheduler:
         except Exception as e:
             self.logger.error(f"Error enviando reporte de estado: {e}")
     
-    def _check_critical_alerts(self):
+    def _check_critical_alerts(self, now: Optional[datetime] = None):
         """Verificar alertas críticas cada hora"""
         try:
+            now = now or datetime.now()
+            
             # Obtener alertas críticas no resueltas
             critical_alerts = self.db.execute_query('''
                 SELECT * FROM alerts 
@@ -153,7 +217,7 @@ class TaskScheduler:
                 
                 # Enviar recordatorio cada 4 horas
                 for alert in critical_alerts:
-                    alert_age = datetime.now() - datetime.fromisoformat(alert['created_at'])
+                    alert_age = now - datetime.fromisoformat(alert['created_at'])
                     if alert_age.total_seconds() % (4 * 3600) < 3600:  # Cada 4 horas
                         self.notifications.notify_critical_finding({
                             'url': alert['url'],
@@ -165,7 +229,7 @@ class TaskScheduler:
         except Exception as e:
             self.logger.error(f"Error verificando alertas críticas: {e}")
     
-    def _cleanup_old_data(self):
+    def _cleanup_old_data(self, now: Optional[datetime] = None):
         """Limpiar datos antiguos de la base de datos"""
         try:
             cleanup_days = self.config.get('database.cleanup_after_days', 30)
@@ -173,34 +237,35 @@ class TaskScheduler:
             # Limpiar hallazgos antiguos no críticos
             deleted_paths = self.db.execute_query('''
                 DELETE FROM discovered_paths 
-                WHERE discovered_at < datetime('now', '-{} days')
+                WHERE discovered_at < datetime('now', ?)
                 AND is_critical = FALSE
-            '''.format(cleanup_days))
+            ''', (f'-{int(cleanup_days)} days',))
             
             # Limpiar alertas resueltas antiguas
             deleted_alerts = self.db.execute_query('''
                 DELETE FROM alerts 
-                WHERE resolved_at < datetime('now', '-{} days')
+                WHERE resolved_at < datetime('now', ?)
                 AND status = 'resolved'
-            '''.format(cleanup_days))
+            ''', (f'-{int(cleanup_days)} days',))
             
             if deleted_paths or deleted_alerts:
+                # Liberar en disco las páginas que dejaron los borrados
+                self.db.incremental_vacuum()
                 self.logger.info(f"Limpieza completada: {deleted_paths} rutas, {deleted_alerts} alertas eliminadas")
                 
         except Exception as e:
             self.logger.error(f"Error en limpieza de datos: {e}")
     
-    def _backup_database(self):
+    def _backup_database(self, now: Optional[datetime] = None):
         """Hacer backup de la base de datos"""
         try:
             import shutil
-            from datetime import datetime
             
             backup_dir = self.config.base_dir / self.config.get('files.backup_dir')
             backup_dir.mkdir(exist_ok=True)
             
             # Nombre del backup con timestamp
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            timestamp = (now or datetime.now()).strftime('%Y%m%d_%H%M%S')
             backup_file = backup_dir / f"webfuzzing_backup_{timestamp}.db"
             
             # Copiar base de datos
@@ -225,6 +290,7 @@ class TaskScheduler:
             return
         
         self.is_running = True
+        self._wakeup.clear()
         self.scheduler_thread = threading.Thread(target=self._run_scheduler, daemon=True)
         self.scheduler_thread.start()
         
@@ -233,6 +299,7 @@ class TaskScheduler:
     def stop(self):
         """Detener el programador de tareas"""
         self.is_running = False
+        self._wakeup.set()
         if self.scheduler_thread:
             self.scheduler_thread.join(timeout=10)
         
@@ -242,11 +309,60 @@ class TaskScheduler:
         """Ejecutar el loop principal del programador"""
         while self.is_running:
             try:
-                schedule.run_pending()
-                time.sleep(60)  # Verificar cada minuto
+                if not self._heap:
+                    self._wait(30)
+                    continue
+                
+                delay = self._heap[0][0] - time.time()
+                if delay > 0:
+                    # Dormir hasta la próxima tarea (máx. 1 hora para absorber cambios de reloj)
+                    self._wait(min(delay, 3600))
+                    continue
+                
+                # Extraer de una vez todas las tareas que coinciden en este instante
+                now_ts = time.time()
+                due = []
+                while self._heap and self._heap[0][0] <= now_ts:
+                    due.append(heapq.heappop(self._heap))
+                
+                self._run_due_tasks(due, datetime.now())
             except Exception as e:
                 self.logger.error(f"Error en el programador: {e}")
-                time.sleep(60)
+                self._wait(60)
+    
+    def _wait(self, seconds: float):
+        """Esperar hasta el timeout o hasta que se registre una tarea o se detenga el programador"""
+        self._wakeup.wait(seconds)
+        self._wakeup.clear()
+    
+    def _run_due_tasks(self, due: List[Tuple[float, str]], now: datetime):
+        """Ejecutar un lote de tareas vencidas y reprogramarlas en una sola pasada"""
+        executed = []
+        executed_names = set()
+        for scheduled_ts, name in due:
+            task = self.tasks.get(name)
+            # Entrada obsoleta del heap (tarea eliminada o re-registrada)
+            if task is None or task.next_run is None or task.next_run.timestamp() != scheduled_ts:
+                continue
+            # Entrada duplicada (misma tarea registrada dos veces para el mismo instante)
+            if name in executed_names:
+                continue
+            executed_names.add(name)
+            
+            try:
+                task.handler(now)
+            except Exception as e:
+                self.logger.error(f"Error ejecutando tarea {task.name}: {e}")
+            
+            executed.append(task)
+        
+        for task in executed:
+            task.last_run = now
+            task.next_run = self._calculate_next_run(task, now)
+            heapq.heappush(self._heap, (task.next_run.timestamp(), task.name))
+        
+        if executed:
+            self._next_tasks_cache = (0.0, None)
     
     def run_manual_scan(self):
         """Ejecutar escaneo manual"""
@@ -265,15 +381,29 @@ class TaskScheduler:
     
     def get_next_scheduled_tasks(self):
         """Obtener próximas tareas programadas"""
+        # El listado sólo cambia al registrar o ejecutar tareas: se reutiliza
+        # hasta la próxima ejecución (máx. 30 s) para no recalcularlo en cada consulta
+        now = time.time()
+        expires_at, cached = self._next_tasks_cache
+        if cached is not None and now < expires_at:
+            return list(cached)
+        
         jobs = []
-        for job in schedule.jobs:
+        for task in sorted(self.tasks.values(), key=lambda t: t.next_run or datetime.max):
             jobs.append({
-                'job': str(job.job_func.__name__),
-                'next_run': job.next_run.isoformat() if job.next_run else None,
-                'interval': str(job.interval),
-                'unit': job.unit
+                'job': task.handler.__name__,
+                'name': task.name,
+                'pattern': task.pattern,
+                'next_run': task.next_run.isoformat() if task.next_run else None,
+                'last_run': task.last_run.isoformat() if task.last_run else None
             })
-        return jobs
+        
+        expires_at = now + 30
+        if self._heap:
+            expires_at = min(expires_at, self._heap[0][0])
+        self._next_tasks_cache = (expires_at, jobs)
+        
+        return list(jobs)
     
     def start_all_services(self):
         """Iniciar todos los servicios del sistema"""
@@ -5,12 +5,15 @@ import json
 import secrets
 from pathlib import Path
 
+# Directorio raíz del proyecto (resuelto una sola vez al importar el módulo)
+BASE_DIR = Path(__file__).resolve().parent.parent
+CONFIG_FILE = BASE_DIR / "config.json"
+
 def generate_secret_keys():
     """Generar claves secretas seguras"""
     print("🔐 Generando claves secretas...")
     
-    base_dir = Path(__file__).parent.parent
-    config_file = base_dir / "config.json"
+    config_file = CONFIG_FILE
     
     if not config_file.exists():
         print("❌ Error: config.json no encontrado. Ejecuta install.py primero.")
@@ -49,8 +52,7 @@ def setup_telegram_bot():
         return
     
     # Actualizar configuración
-    base_dir = Path(__file__).parent.parent
-    config_file = base_dir / "config.json"
+    config_file = CONFIG_FILE
     
     with open(config_file, 'r', encoding='utf-8') as f:
         config = json.load(f)
@@ -112,8 +114,7 @@ def setup_email():
         recipients = [email]
     
     # Actualizar configuración
-    base_dir = Path(__file__).parent.parent
-    config_file = base_dir / "config.json"
+    config_file = CONFIG_FILE
     
     with open(config_file, 'r', encoding='utf-8') as f:
         config = json.load(f)
@@ -134,7 +135,7 @@ def create_startup_scripts():
     """Crear scripts de inicio"""
     print("\n📝 Creando scripts de inicio...")
     
-    base_dir = Path(__file__).parent.parent
+    base_dir = BASE_DIR
     
     # Script para Windows
     bat_content = f"""@echo off
@@ -171,7 +172,7 @@ def setup_scheduled_tasks():
     print("\n⏰ Configuración de tareas programadas")
     
     system = os.name
-    base_dir = Path(__file__).parent.parent
+    base_dir = BASE_DIR
     
     if system == 'nt':  # Windows
         print("Para Windows - Task Scheduler:")
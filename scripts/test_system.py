@@ -54,7 +54,7 @@ class SystemTester:
         self.print_header("PRUEBAS DE DEPENDENCIAS")
         
         required_modules = [
-            'flask', 'requests', 'schedule', 'sqlite3', 
+            'flask', 'requests', 'croniter', 'sqlite3', 
             'concurrent.futures', 'threading', 'json', 'csv'
         ]
         
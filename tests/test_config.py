@@ -0,0 +1,95 @@
+# tests/test_config.py
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+import json
+import sys
+
+# Agregar el directorio raíz al path para importaciones
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import config.settings as settings
+from config.settings import Config
+
+class TestConfigYamlCache(unittest.TestCase):
+    """Tests para la caché de archivos YAML de configuración"""
+
+    def setUp(self):
+        """Configurar entorno de prueba"""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.config_file = self.test_dir / 'config.yaml'
+        self.config_file.write_text('api:\n  port: 8123\n', encoding='utf-8')
+        self.cache_file = Path(str(self.config_file) + '.cache.json')
+        settings._PARSE_CACHE.clear()
+
+    def tearDown(self):
+        """Limpiar después de las pruebas"""
+        settings._PARSE_CACHE.clear()
+        shutil.rmtree(self.test_dir)
+
+    def test_cache_is_json(self):
+        """La caché junto al YAML es JSON con la firma del archivo"""
+        config = Config(str(self.config_file))
+
+        self.assertEqual(config.get('api.port'), 8123)
+        cached = json.loads(self.cache_file.read_text(encoding='utf-8'))
+        self.assertEqual(cached['data'], {'api': {'port': 8123}})
+        self.assertEqual(len(cached['signature']), 2)
+
+    def test_cache_used_without_parsing(self):
+        """Con la caché vigente no se vuelve a parsear el YAML"""
+        Config(str(self.config_file))
+        settings._PARSE_CACHE.clear()
+
+        original_get_yaml = settings._get_yaml
+        settings._get_yaml = None  # Fallaría si se intentara parsear
+        try:
+            config = Config(str(self.config_file))
+        finally:
+            settings._get_yaml = original_get_yaml
+
+        self.assertEqual(config.get('api.port'), 8123)
+
+    def test_parse_cache_keeps_latest_per_file(self):
+        """Al recargar un archivo modificado se reemplaza su entrada en memoria"""
+        config = Config(str(self.config_file))
+        self.config_file.write_text('api:\n  port: 9000\n', encoding='utf-8')
+        config.reload()
+
+        self.assertEqual(config.get('api.port'), 9000)
+        self.assertEqual(len(settings._PARSE_CACHE), 1)
+
+class TestConfigSet(unittest.TestCase):
+    """Tests para set() con valores obtenidos de get()"""
+
+    def setUp(self):
+        """Configurar entorno de prueba"""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.config = Config(str(self.test_dir / 'missing.json'))
+
+    def tearDown(self):
+        """Limpiar después de las pruebas"""
+        shutil.rmtree(self.test_dir)
+
+    def test_set_get_save_with_frozen_values(self):
+        """Una sección o lista leída con get() se puede volver a guardar con set()"""
+        section = self.config.get('api')
+        hosts = self.config.get('security.allowed_hosts')
+
+        self.config.set('api_copy', section)
+        self.config.set('security.allowed_hosts', hosts + ('10.0.0.1',))
+
+        self.assertEqual(self.config.get('api_copy.port'), 8000)
+        self.assertIn('10.0.0.1', self.config.get('security.allowed_hosts'))
+
+        output_file = self.test_dir / 'saved.json'
+        self.assertTrue(self.config.save(str(output_file)))
+
+        with open(output_file, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        self.assertEqual(saved['api_copy']['port'], 8000)
+        self.assertEqual(saved['security']['allowed_hosts'][-1], '10.0.0.1')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -389,12 +389,12 @@ def run_tests():
     if result.errors:
         print(f"\nERRORES:")
         for test, error in result.errors:
-            print(f"  - {test}: {error.split('\\n')[-2] if error else 'Unknown'}")
+            print(f"  - {test}: {error.splitlines()[-1] if error else 'Unknown'}")
     
     if result.failures:
         print(f"\nFALLOS:")
         for test, failure in result.failures:
-            print(f"  - {test}: {failure.split('\\n')[-2] if failure else 'Unknown'}")
+            print(f"  - {test}: {failure.splitlines()[-1] if failure else 'Unknown'}")
     
     return result.wasSuccessful()
 
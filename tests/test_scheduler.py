@@ -0,0 +1,120 @@
+# tests/test_scheduler.py
+import unittest
+import tempfile
+import shutil
+import heapq
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+import sys
+
+# Agregar el directorio raíz al path para importaciones
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from croniter import croniter
+
+from config.settings import Config
+import scripts.scheduler as scheduler
+
+class TestTaskScheduler(unittest.TestCase):
+    """Tests para el programador de tareas basado en cron"""
+
+    def setUp(self):
+        """Configurar entorno de prueba"""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.config = Config(str(self.test_dir / 'config.json'))
+
+        # Los servicios externos no intervienen en la programación de tareas
+        patchers = [
+            mock.patch.object(scheduler, 'NotificationManager'),
+            mock.patch.object(scheduler, 'DatabaseManager'),
+            mock.patch.object(scheduler, 'FuzzingEngine'),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.scheduler = scheduler.TaskScheduler(self.config)
+
+        # Partir sin las tareas por defecto
+        self.scheduler.tasks.clear()
+        self.scheduler._heap.clear()
+
+    def tearDown(self):
+        """Limpiar después de las pruebas"""
+        shutil.rmtree(self.test_dir)
+
+    def _pop_due(self):
+        """Extraer del heap todas las entradas"""
+        due = []
+        while self.scheduler._heap:
+            due.append(heapq.heappop(self.scheduler._heap))
+        return due
+
+    def test_invalid_cron_pattern_rejected(self):
+        """Una expresión cron inválida no se registra"""
+        handler = mock.Mock()
+
+        self.assertFalse(self.scheduler.register_cron_task('bad', 'not a cron', handler))
+        self.assertNotIn('bad', self.scheduler.tasks)
+        self.assertEqual(self.scheduler._heap, [])
+
+    def test_due_task_runs_once_and_is_rescheduled(self):
+        """Una tarea vencida se ejecuta una vez y vuelve al heap con su próxima hora"""
+        handler = mock.Mock()
+        self.scheduler.register_cron_task('every_minute', '* * * * *', handler)
+        # Registrar de nuevo para el mismo instante deja una entrada duplicada
+        self.scheduler.register_cron_task('every_minute', '* * * * *', handler)
+
+        task = self.scheduler.tasks['every_minute']
+        now = task.next_run
+        self.scheduler._run_due_tasks(self._pop_due(), now)
+
+        handler.assert_called_once_with(now)
+        expected_next = croniter('* * * * *', now).get_next(datetime)
+        self.assertEqual(task.last_run, now)
+        self.assertEqual(task.next_run, expected_next)
+        self.assertEqual(self.scheduler._heap, [(expected_next.timestamp(), 'every_minute')])
+
+    def test_stale_heap_entries_skipped(self):
+        """Las entradas de tareas re-registradas o eliminadas no se ejecutan"""
+        handler = mock.Mock()
+        removed_handler = mock.Mock()
+        self.scheduler.register_cron_task('task', '* * * * *', handler)
+        stale_entry = self.scheduler._heap[0]
+
+        # Re-registrar con otra expresión deja obsoleta la entrada anterior
+        self.scheduler.register_cron_task('task', '0 0 1 1 *', handler)
+        self.scheduler.register_cron_task('removed', '* * * * *', removed_handler)
+        removed_entry = next(e for e in self.scheduler._heap if e[1] == 'removed')
+        del self.scheduler.tasks['removed']
+
+        self.scheduler._run_due_tasks([stale_entry, removed_entry], datetime.now())
+
+        handler.assert_not_called()
+        removed_handler.assert_not_called()
+        self.assertIsNone(self.scheduler.tasks['task'].last_run)
+
+    def test_next_tasks_cache_invalidated(self):
+        """El listado de próximas tareas se recalcula tras registrar o ejecutar"""
+        self.scheduler.register_cron_task('first', '* * * * *', mock.Mock(__name__='first'))
+        jobs = self.scheduler.get_next_scheduled_tasks()
+        self.assertEqual([job['name'] for job in jobs], ['first'])
+
+        # Registro
+        self.scheduler.register_cron_task('second', '0 0 1 1 *', mock.Mock(__name__='second'))
+        jobs = self.scheduler.get_next_scheduled_tasks()
+        self.assertEqual(sorted(job['name'] for job in jobs), ['first', 'second'])
+
+        # Ejecución
+        task = self.scheduler.tasks['first']
+        now = task.next_run
+        due = [entry for entry in self._pop_due() if entry[1] == 'first']
+        self.scheduler._run_due_tasks(due, now)
+
+        jobs = {job['name']: job for job in self.scheduler.get_next_scheduled_tasks()}
+        self.assertEqual(jobs['first']['last_run'], now.isoformat())
+        self.assertEqual(jobs['first']['next_run'], task.next_run.isoformat())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,11 +9,26 @@ from datetime import datetime
 import zipfile
 import tempfile
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Dependencia opcional: se usa json estándar
+
 from utils.logger import get_logger
 
+# Opciones de orjson equivalentes a json.dump(indent=2, default=str): las fechas
+# se delegan a default=str para conservar el mismo formato de salida
+_ORJSON_OPTIONS = (
+    orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    if orjson else 0
+)
+
 class FileManager:
     """Gestor de archivos del sistema"""
     
+    # Directorios ya creados/verificados en este proceso (compartido entre instancias)
+    _ensured_dirs = set()
+    
     def __init__(self, config):
         self.config = config
         self.logger = get_logger(__name__)
@@ -21,8 +36,12 @@ class FileManager:
     
     def ensure_directory(self, path: Path) -> bool:
         """Asegurar que un directorio existe"""
+        if path in self._ensured_dirs:
+            return True
+        
         try:
             path.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(path)
             return True
         except Exception as e:
             self.logger.error(f"Error creando directorio {path}: {e}")
@@ -33,8 +52,12 @@ class FileManager:
         try:
             self.ensure_directory(filepath.parent)
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+            if orjson is not None:
+                with open(filepath, 'wb') as f:
+                    f.write(orjson.dumps(data, default=str, option=_ORJSON_OPTIONS))
+            else:
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False, default=str)
             
             return True
         except Exception as e:
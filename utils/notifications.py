@@ -1,11 +1,38 @@
 # utils/notifications.py
 import smtplib
+from html import escape
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import List, Dict
 from utils.logger import get_logger
 from integrations.telegram_bot import TelegramBot
 
+# Plantillas HTML de los emails: se definen una sola vez a nivel de módulo y en
+# cada envío solo se sustituyen los valores variables
+_CRITICAL_FINDING_TEMPLATE = """
+            <h2>Alerta Crítica de Seguridad</h2>
+            <p><strong>URL:</strong> {url}</p>
+            <p><strong>Código de estado:</strong> {status_code}</p>
+            <p><strong>Ruta:</strong> {path}</p>
+            <p><strong>Tamaño de contenido:</strong> {content_length} bytes</p>
+            <p><strong>Tipo de contenido:</strong> {content_type}</p>
+            <p><em>Esta ruta puede contener información sensible que requiere atención inmediata.</em></p>
+            """
+
+_SCAN_REPORT_TEMPLATE = """
+            <h2>Reporte de Escaneo Web</h2>
+            
+            <h3>Resumen</h3>
+            <ul>
+                <li><strong>Dominios escaneados:</strong> {total_domains}</li>
+                <li><strong>Rutas encontradas:</strong> {paths_found}</li>
+                <li><strong>Rutas críticas:</strong> {critical_found}</li>
+                <li><strong>Duración:</strong> {scan_duration:.1f} segundos</li>
+            </ul>
+            """
+
+_CRITICAL_ITEM_TEMPLATE = "<li><strong>{url}</strong> [{status_code}]</li>"
+
 class NotificationManager:
     """Gestor central de notificaciones"""
     
@@ -67,15 +94,13 @@ class NotificationManager:
         # Email
         if self.email_enabled:
             subject = f"🚨 Alerta Crítica: {finding['path']}"
-            body = f"""
-            <h2>Alerta Crítica de Seguridad</h2>
-            <p><strong>URL:</strong> {finding['url']}</p>
-            <p><strong>Código de estado:</strong> {finding['status_code']}</p>
-            <p><strong>Ruta:</strong> {finding['path']}</p>
-            <p><strong>Tamaño de contenido:</strong> {finding.get('content_length', 'N/A')} bytes</p>
-            <p><strong>Tipo de contenido:</strong> {finding.get('content_type', 'N/A')}</p>
-            <p><em>Esta ruta puede contener información sensible que requiere atención inmediata.</em></p>
-            """
+            body = _CRITICAL_FINDING_TEMPLATE.format(
+                url=escape(str(finding['url'])),
+                status_code=finding['status_code'],
+                path=escape(str(finding['path'])),
+                content_length=finding.get('content_length', 'N/A'),
+                content_type=escape(str(finding.get('content_type', 'N/A')))
+            )
             success &= self.send_email(subject, body)
         
         return success
@@ -96,28 +121,26 @@ class NotificationManager:
             critical_findings = [f for f in findings if f.get('is_critical', False)]
             normal_findings = [f for f in findings if not f.get('is_critical', False)]
             
-            body = f"""
-            <h2>Reporte de Escaneo Web</h2>
-            
-            <h3>Resumen</h3>
-            <ul>
-                <li><strong>Dominios escaneados:</strong> {stats.get('total_domains', 0)}</li>
-                <li><strong>Rutas encontradas:</strong> {stats.get('paths_found', 0)}</li>
-                <li><strong>Rutas críticas:</strong> {stats.get('critical_found', 0)}</li>
-                <li><strong>Duración:</strong> {stats.get('scan_duration', 0):.1f} segundos</li>
-            </ul>
-            """
+            parts = [_SCAN_REPORT_TEMPLATE.format(
+                total_domains=stats.get('total_domains', 0),
+                paths_found=stats.get('paths_found', 0),
+                critical_found=stats.get('critical_found', 0),
+                scan_duration=stats.get('scan_duration', 0)
+            )]
             
             if critical_findings:
-                body += "<h3>🚨 Hallazgos Críticos</h3><ul>"
-                for finding in critical_findings[:10]:  # Limitar a 10
-                    body += f"<li><strong>{finding['url']}</strong> [{finding['status_code']}]</li>"
-                body += "</ul>"
+                parts.append("<h3>🚨 Hallazgos Críticos</h3><ul>")
+                parts.extend(
+                    _CRITICAL_ITEM_TEMPLATE.format(url=escape(str(finding['url'])), status_code=finding['status_code'])
+                    for finding in critical_findings[:10]  # Limitar a 10
+                )
+                parts.append("</ul>")
             
             if normal_findings:
-                body += f"<h3>📁 Otros Hallazgos ({len(normal_findings)})</h3>"
-                body += "<p>Ver reporte completo en el dashboard web.</p>"
+                parts.append(f"<h3>📁 Otros Hallazgos ({len(normal_findings)})</h3>")
+                parts.append("<p>Ver reporte completo en el dashboard web.</p>")
             
+            body = ''.join(parts)
             success &= self.send_email(subject, body)
         
         return success
\ No newline at end of file
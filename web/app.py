@@ -85,10 +85,10 @@ def create_app(config):
                 SELECT dp.*, d.domain
                 FROM discovered_paths dp
                 JOIN domains d ON dp.domain_id = d.id
-                WHERE dp.discovered_at >= datetime('now', '-{} hours')
-            '''.format(hours)
+                WHERE dp.discovered_at >= datetime('now', ?)
+            '''
             
-            params = []
+            params = [f'-{hours} hours']
             
             if domain_filter:
                 query += ' AND d.domain LIKE ?'
@@ -322,47 +322,53 @@ def create_app(config):
                 SELECT dp.*, d.domain
                 FROM discovered_paths dp
                 JOIN domains d ON dp.domain_id = d.id
-                WHERE dp.discovered_at >= datetime('now', '-{} hours')
-            '''.format(hours)
+                WHERE dp.discovered_at >= datetime('now', ?)
+            '''
             
             if critical_only:
                 query += ' AND dp.is_critical = TRUE'
             
             query += ' ORDER BY dp.discovered_at DESC'
             
-            findings = db.execute_query(query, fetch=True)
-            
-            # Crear CSV
-            output = StringIO()
-            writer = csv.writer(output)
-            
-            # Encabezados
-            writer.writerow([
-                'Dominio', 'URL', 'Ruta', 'Código Estado', 'Tamaño',
-                'Tipo Contenido', 'Tiempo Respuesta', 'Es Crítico',
-                'Descubierto en', 'Última vez visto'
-            ])
-            
-            # Datos
-            for finding in findings:
+            def generate_csv():
+                # Emitir el CSV fila a fila en lugar de materializarlo completo en memoria
+                output = StringIO()
+                writer = csv.writer(output)
+                
+                # Encabezados
                 writer.writerow([
-                    finding['domain'],
-                    finding['full_url'],
-                    finding['path'],
-                    finding['status_code'],
-                    finding['content_length'],
-                    finding['content_type'],
-                    finding['response_time'],
-                    'Sí' if finding['is_critical'] else 'No',
-                    finding['discovered_at'],
-                    finding['last_seen']
+                    'Dominio', 'URL', 'Ruta', 'Código Estado', 'Tamaño',
+                    'Tipo Contenido', 'Tiempo Respuesta', 'Es Crítico',
+                    'Descubierto en', 'Última vez visto'
                 ])
-            
-            output.seek(0)
+                
+                # Datos: recorrer el cursor sin cargar todos los resultados
+                with db.get_connection() as conn:
+                    cursor = conn.execute(query, (f'-{hours} hours',))
+                    for finding in cursor:
+                        writer.writerow([
+                            finding['domain'],
+                            finding['full_url'],
+                            finding['path'],
+                            finding['status_code'],
+                            finding['content_length'],
+                            finding['content_type'],
+                            finding['response_time'],
+                            'Sí' if finding['is_critical'] else 'No',
+                            finding['discovered_at'],
+                            finding['last_seen']
+                        ])
+                        yield output.getvalue()
+                        output.seek(0)
+                        output.truncate(0)
+                
+                # Encabezados cuando no hay hallazgos
+                if output.tell():
+                    yield output.getvalue()
             
             from flask import Response
             return Response(
-                output.getvalue(),
+                generate_csv(),
                 mimetype='text/csv',
                 headers={
                     'Content-Disposition': f'attachment; filename=hallazgos_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'